@@ -0,0 +1,47 @@
+import argparse
+import json
+import timeit
+from collections.abc import Callable
+from dataclasses import asdict
+from typing import Any
+
+from src.fake_server import generate_fleet
+from src.models import Vehicle
+from src.vehicle_manager.codec import CODECS, get_codec
+
+
+def make_payload(vehicles: int) -> bytes:
+    return json.dumps([asdict(vehicle) for vehicle in generate_fleet(vehicles)]).encode()
+
+
+def run(vehicles: int, repeat: int) -> dict[str, float]:
+    payload = make_payload(vehicles)
+
+    def measure(decode: Callable[[bytes], Any]) -> float:
+        timer = timeit.Timer(lambda: decode(payload))
+        return vehicles / min(timer.repeat(number=1, repeat=repeat))
+
+    def baseline(data: bytes) -> list[Vehicle]:
+        # What ``API.get_list`` followed by ``Vehicle.parse`` did before codecs.
+        return [Vehicle.parse(data=value) for value in json.loads(data)]
+
+    results = {"json + parse": measure(baseline)}
+    for name in CODECS:
+        codec = get_codec(name)
+        results[f"{name} loads"] = measure(codec.loads)
+        results[f"{name} vehicles"] = measure(codec.loads_vehicles)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Decode throughput of the JSON codecs")
+    parser.add_argument("--vehicles", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, ops in run(vehicles=args.vehicles, repeat=args.repeat).items():
+        print(f"{name:<18} {ops:>14,.0f} vehicles/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import argparse
+import random
+import timeit
+
+from src.vehicle_manager.distance import DISTANCE_FUNCTIONS, DistanceFunc, DistanceMode
+
+
+def run(pairs: int, repeat: int) -> dict[DistanceMode, float]:
+    rnd = random.Random(0)
+    points = [
+        (rnd.uniform(-90, 90), rnd.uniform(-180, 180), rnd.uniform(-90, 90), rnd.uniform(-180, 180))
+        for _ in range(pairs)
+    ]
+
+    def measure(func: DistanceFunc) -> float:
+        timer = timeit.Timer(lambda: [func(*point) for point in points])
+        return pairs / min(timer.repeat(number=1, repeat=repeat))
+
+    return {mode: measure(func) for mode, func in DISTANCE_FUNCTIONS.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput of the distance formulas")
+    parser.add_argument("--pairs", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for mode, ops in run(pairs=args.pairs, repeat=args.repeat).items():
+        print(f"{mode:<16} {ops:>14,.0f} ops/sec")
+
+
+if __name__ == "__main__":
+    main()
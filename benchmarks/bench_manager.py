@@ -0,0 +1,174 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any
+
+from src.fake_server import generate_fleet
+from src.models import Vehicle
+from src.vehicle_manager import VehicleManager
+
+BASELINE = Path(__file__).with_name("baseline.json")
+# Peaks of a few dozen KiB jitter with allocator and thread pool state.
+MEMORY_SLACK_KB = 64
+
+
+@dataclass
+class Result:
+    operation: str
+    size: int
+    calls: int
+    ops_per_sec: float
+    p50_ms: float
+    p99_ms: float
+    peak_memory_kb: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.operation}[{self.size}]"
+
+
+def measure(operation: str, size: int, func: Callable[[int], object], calls: int) -> Result:
+    """Call ``func(0)`` once under tracemalloc for the peak memory, then time ``calls`` more."""
+    tracemalloc.start()
+    func(0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = []
+    started = time.perf_counter()
+    for i in range(1, calls + 1):
+        call_started = time.perf_counter()
+        func(i)
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return Result(
+        operation=operation,
+        size=size,
+        calls=calls,
+        ops_per_sec=calls / elapsed,
+        p50_ms=_percentile(latencies, 0.50) * 1000,
+        p99_ms=_percentile(latencies, 0.99) * 1000,
+        peak_memory_kb=peak / 1024,
+    )
+
+
+def _percentile(latencies: list[float], q: float) -> float:
+    return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+
+@contextmanager
+def fake_server(size: int, latency: float) -> Iterator[str]:
+    """``src.fake_server`` in a child process, so its allocations and GIL time stay out."""
+    command = [sys.executable, "-m", "src.fake_server", "--port", "0"]
+    command += ["--fleet-size", str(size), "--latency", str(latency)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)  # noqa: S603
+    try:
+        banner = process.stdout.readline() if process.stdout else ""
+        yield banner.rsplit(" ", 1)[-1].strip()
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def run_size(
+    size: int, calls: int, list_calls: int, cache_ttl: float, latency: float
+) -> Iterator[Result]:
+    with fake_server(size, latency) as url, VehicleManager(url=url, cache_ttl=cache_ttl) as vm:
+
+        def pick(i: int) -> int:
+            return i * 7919 % size + 1
+
+        yield measure("get_vehicles", size, lambda i: vm.get_vehicles(), list_calls)
+        yield measure(
+            "filter_vehicles",
+            size,
+            lambda i: vm.filter_vehicles({"color": "red", "price__lt": 30_000}),
+            list_calls,
+        )
+        yield measure(
+            "get_nearest_vehicle", size, lambda i: vm.get_nearest_vehicle(pick(i)), list_calls
+        )
+        yield measure("get_vehicle", size, lambda i: vm.get_vehicle(pick(i)), calls)
+        yield measure("get_distance", size, lambda i: vm.get_distance(pick(i), pick(i + 1)), calls)
+        yield from _measure_crud(vm, generate_fleet(1)[0], size, calls)
+
+
+def _measure_crud(vm: VehicleManager, template: Vehicle, size: int, calls: int) -> Iterator[Result]:
+    created: list[Vehicle] = []
+
+    def add(i: int) -> None:
+        created.append(vm.add_vehicle(replace(template, id=None, price=i)))
+
+    yield measure("add_vehicle", size, add, calls)
+    yield measure(
+        "update_vehicle", size, lambda i: vm.update_vehicle(replace(created[i], year=2000)), calls
+    )
+    yield measure("delete_vehicle", size, lambda i: vm.delete_vehicle(created[i].id or 0), calls)
+
+
+def compare(results: list[Result], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Regressions against the baseline: lower throughput or higher peak memory."""
+    regressions = []
+    for result in results:
+        if (expected := baseline.get(result.key)) is None:
+            continue
+        if result.ops_per_sec < expected["ops_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{result.key}: {result.ops_per_sec:,.0f} ops/sec, "
+                f"baseline {expected['ops_per_sec']:,.0f}"
+            )
+        if result.peak_memory_kb > expected["peak_memory_kb"] * (1 + tolerance) + MEMORY_SLACK_KB:
+            regressions.append(
+                f"{result.key}: {result.peak_memory_kb:,.0f} KiB peak, "
+                f"baseline {expected['peak_memory_kb']:,.0f}"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="VehicleManager hot paths against a local server")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma separated fleet sizes")
+    parser.add_argument("--calls", type=int, default=200, help="calls of single-vehicle operations")
+    parser.add_argument(
+        "--list-calls", type=int, default=10, help="calls of whole-fleet operations"
+    )
+    parser.add_argument("--cache-ttl", type=float, default=0, help="fleet cache of the manager")
+    parser.add_argument("--latency", type=float, default=0, help="server latency, seconds")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'operation':<26} {'ops/sec':>10} {'p50 ms':>9} {'p99 ms':>9} {'peak KiB':>10}")
+    for size in map(int, args.sizes.split(",")):
+        for result in run_size(size, args.calls, args.list_calls, args.cache_ttl, args.latency):
+            results.append(result)
+            print(
+                f"{result.key:<26} {result.ops_per_sec:>10,.1f} {result.p50_ms:>9.2f} "
+                f"{result.p99_ms:>9.2f} {result.peak_memory_kb:>10,.0f}"
+            )
+
+    if args.update_baseline:
+        baseline = {result.key: asdict(result) for result in results}
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        return
+    if args.baseline.exists():
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import itertools
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_manager import fake_server
+from src.vehicle_manager import VehicleManager
+
+THREADS = (1, 2, 4, 8, 16, 32)
+
+
+def run(threads: int, calls: int, func: Callable[[int], object]) -> float:
+    """Ops/sec of ``calls`` calls of ``func`` spread over ``threads`` threads."""
+    counter = itertools.count()
+    lock = threading.Lock()
+
+    def worker() -> None:
+        while True:
+            with lock:
+                i = next(counter)
+            if i >= calls:
+                return
+            func(i)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for future in [executor.submit(worker) for _ in range(threads)]:
+            future.result()
+    return calls / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput of one shared VehicleManager")
+    parser.add_argument("--size", type=int, default=1000, help="fleet size")
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.005, help="server latency, seconds")
+    args = parser.parse_args()
+
+    with (
+        fake_server(args.size, args.latency) as url,
+        VehicleManager(url=url, cache_ttl=60, pool_maxsize=max(THREADS)) as manager,
+    ):
+        operations: dict[str, Callable[[int], object]] = {
+            "get_vehicle": lambda i: manager.get_vehicle(i % args.size + 1),
+            "get_vehicles (cached)": lambda i: manager.get_vehicles(),
+            "get_k_nearest (cached)": lambda i: manager.get_k_nearest((i % 90, i % 180), k=5),
+        }
+        manager.get_vehicles()
+        for name, func in operations.items():
+            single = run(1, args.calls, func)
+            print(f"{name}")
+            for threads in THREADS:
+                ops = single if threads == 1 else run(threads, args.calls, func)
+                print(f"  {threads:>2} threads {ops:>12,.0f} ops/sec  x{ops / single:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,3 +8,6 @@ class VehiclesInavlidResponseError(VehicleManagerAPIError): ...
 
 
 class VehicleNotFoundError(BaseVehicleError): ...
+
+
+class VehicleManagerUnavailableError(VehicleManagerAPIError): ...
@@ -0,0 +1,297 @@
+"""Local asyncio stand-in for the vehicles REST API.
+
+Run it and point ``VehicleManager`` at the printed URL::
+
+    python -m src.fake_server --fleet-size 100000 --latency 0.005 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import random
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import asdict
+from http import HTTPStatus
+from types import TracebackType
+from typing import Any, NamedTuple, Self
+from urllib.parse import parse_qsl, urlsplit
+
+from src.models import Vehicle
+
+NAMES = ("Toyota", "Lada", "BMW", "Tesla", "Kia")
+MODELS = ("Camry", "Vesta", "X5", "Model 3", "Rio")
+COLORS = ("red", "blue", "black", "white", "silver")
+
+
+def generate_fleet(size: int, seed: int = 0) -> list[Vehicle]:
+    """Deterministic synthetic fleet with ids ``1..size``."""
+    rnd = random.Random(seed)
+    return [
+        Vehicle(
+            id=vehicle_id,
+            name=rnd.choice(NAMES),
+            model=rnd.choice(MODELS),
+            year=rnd.randint(1990, 2024),
+            color=rnd.choice(COLORS),
+            price=rnd.randint(1_000, 100_000),
+            latitude=rnd.uniform(-90, 90),
+            longitude=rnd.uniform(-180, 180),
+        )
+        for vehicle_id in range(1, size + 1)
+    ]
+
+
+class _Request(NamedTuple):
+    method: str
+    path: str
+    query: dict[str, str]
+    headers: dict[str, str]
+    body: bytes
+
+
+class _Response(NamedTuple):
+    status: HTTPStatus
+    body: bytes = b""
+    headers: dict[str, str] = {}
+
+
+class FakeVehiclesServer:
+    """Serves ``GET/POST /vehicles`` and ``GET/PUT/DELETE /vehicles/{id}`` over real sockets.
+
+    ``latency`` seconds (plus up to ``jitter``) are added to every response and a share of
+    ``error_rate`` requests fail with ``503``. The list supports ``?field=value`` filters and
+    ``ETag`` revalidation. Use it with ``asyncio`` via ``serve`` or from synchronous code as a
+    context manager, which runs the event loop in a background thread.
+    """
+
+    def __init__(
+        self,
+        vehicles: Iterable[Vehicle] = (),
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        self.vehicles = {vehicle.id: asdict(vehicle) for vehicle in vehicles}
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._next_id = max((vehicle_id or 0 for vehicle_id in self.vehicles), default=0) + 1
+        self._list: tuple[bytes, str] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopped: asyncio.Event | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def serve(self, on_ready: Callable[[], object] | None = None) -> None:
+        """Serve until ``stop`` is called, ``on_ready`` runs once the port is bound."""
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        if on_ready is not None:
+            on_ready()
+        try:
+            await self._stopped.wait()
+        finally:
+            # Keep-alive connections are cancelled with their tasks when the loop ends.
+            server.close()
+
+    def start(self) -> None:
+        """Serve in a background thread; startup errors such as a busy port are raised here."""
+        ready = threading.Event()
+        errors: list[BaseException] = []
+
+        def run() -> None:
+            try:
+                asyncio.run(self.serve(ready.set))
+            except BaseException as err:
+                if ready.is_set():
+                    raise
+                errors.append(err)
+            finally:
+                ready.set()
+
+        self._thread = threading.Thread(target=run, name="fake-vehicles", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            self._thread.join()
+            self._thread = None
+            raise errors[0]
+
+    def stop(self) -> None:
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while (request := await _read_request(reader)) is not None:
+                response = await self._respond(request)
+                writer.write(_encode_response(response))
+                await writer.drain()
+                if request.headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, request: _Request) -> _Response:
+        self.requests += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+        if self.error_rate and self._random.random() < self.error_rate:
+            return _Response(HTTPStatus.SERVICE_UNAVAILABLE)
+        try:
+            return self._route(request)
+        except (ValueError, TypeError):
+            return _Response(HTTPStatus.BAD_REQUEST)
+
+    def _route(self, request: _Request) -> _Response:
+        parts = request.path.strip("/").split("/")
+        match request.method, parts:
+            case "GET", ["vehicles"]:
+                return self._list_vehicles(request)
+            case "POST", ["vehicles"]:
+                return self._save(None, request.body)
+            case "GET", ["vehicles", vehicle_id]:
+                return _json_response(self.vehicles.get(int(vehicle_id)))
+            case "PUT", ["vehicles", vehicle_id]:
+                return self._save(int(vehicle_id), request.body)
+            case "DELETE", ["vehicles", vehicle_id]:
+                return self._delete(int(vehicle_id))
+            case _, ["vehicles"] | ["vehicles", _]:
+                return _Response(HTTPStatus.METHOD_NOT_ALLOWED)
+        return _Response(HTTPStatus.NOT_FOUND)
+
+    def _list_vehicles(self, request: _Request) -> _Response:
+        if request.query:
+            matched = [
+                vehicle
+                for vehicle in self.vehicles.values()
+                if all(str(vehicle.get(key)) == value for key, value in request.query.items())
+            ]
+            return _Response(HTTPStatus.OK, json.dumps(matched).encode())
+
+        if self._list is None:
+            body = json.dumps(list(self.vehicles.values())).encode()
+            self._list = body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        body, etag = self._list
+        if request.headers.get("if-none-match") == etag:
+            return _Response(HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+        return _Response(HTTPStatus.OK, body, {"ETag": etag})
+
+    def _save(self, vehicle_id: int | None, body: bytes) -> _Response:
+        data = json.loads(body)
+        if vehicle_id is None:
+            vehicle_id, self._next_id = self._next_id, self._next_id + 1
+            status = HTTPStatus.CREATED
+        elif vehicle_id in self.vehicles:
+            status = HTTPStatus.OK
+        else:
+            return _Response(HTTPStatus.NOT_FOUND)
+        self.vehicles[vehicle_id] = asdict(Vehicle.parse(data=data | {"id": vehicle_id}))
+        self._list = None
+        return _json_response(self.vehicles[vehicle_id], status)
+
+    def _delete(self, vehicle_id: int) -> _Response:
+        if self.vehicles.pop(vehicle_id, None) is None:
+            return _Response(HTTPStatus.NOT_FOUND)
+        self._list = None
+        return _Response(HTTPStatus.NO_CONTENT)
+
+
+async def _read_request(reader: asyncio.StreamReader) -> _Request | None:
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+    url = urlsplit(target)
+    return _Request(method, url.path, dict(parse_qsl(url.query)), headers, body)
+
+
+def _encode_response(response: _Response) -> bytes:
+    headers = {
+        "Content-Type": "application/json",
+        "Content-Length": str(len(response.body)),
+        **response.headers,
+    }
+    head = f"HTTP/1.1 {response.status.value} {response.status.phrase}\r\n" + "".join(
+        f"{name}: {value}\r\n" for name, value in headers.items()
+    )
+    return head.encode("latin-1") + b"\r\n" + response.body
+
+
+def _json_response(data: dict[str, Any] | None, status: HTTPStatus = HTTPStatus.OK) -> _Response:
+    if data is None:
+        return _Response(HTTPStatus.NOT_FOUND)
+    return _Response(status, json.dumps(data).encode())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for the vehicles API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--fleet-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 503 responses")
+    args = parser.parse_args()
+
+    server = FakeVehiclesServer(
+        generate_fleet(args.fleet_size, seed=args.seed),
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(
+            server.serve(
+                on_ready=lambda: print(
+                    f"Serving {args.fleet_size} vehicles on {server.url}", flush=True
+                )
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
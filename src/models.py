@@ -1,8 +1,11 @@
-from dataclasses import dataclass
-from typing import Self
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Self, overload
 
 
-@dataclass
+@dataclass(slots=True)
 class Vehicle:
     name: str
     model: str
@@ -16,3 +19,138 @@ class Vehicle:
     @classmethod
     def parse(cls, data: dict) -> Self:
         return cls(**data)
+
+    def copy(self) -> Self:
+        return type(self)(
+            self.name,
+            self.model,
+            self.year,
+            self.color,
+            self.price,
+            self.latitude,
+            self.longitude,
+            self.id,
+        )
+
+
+class VehicleTable(Sequence[Vehicle]):
+    """Columnar fleet storage: numeric fields in typed arrays, interned repeated strings.
+
+    Rows are materialized as ``Vehicle`` objects only when accessed.
+    """
+
+    NO_ID = -1
+
+    __slots__ = ("ids", "names", "models", "years", "colors", "prices", "latitudes", "longitudes")
+
+    def __init__(self) -> None:
+        self.ids = array("q")
+        self.names: list[str] = []
+        self.models: list[str] = []
+        self.years = array("q")
+        self.colors: list[str] = []
+        self.prices = array("q")
+        self.latitudes = array("d")
+        self.longitudes = array("d")
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict[str, Any]]) -> Self:
+        table = cls()
+        for record in records:
+            table.append(Vehicle.parse(data=record))
+        return table
+
+    @classmethod
+    def from_vehicles(cls, vehicles: Iterable[Vehicle]) -> Self:
+        table = cls()
+        for vehicle in vehicles:
+            table.append(vehicle)
+        return table
+
+    @classmethod
+    def from_columns(
+        cls,
+        *,
+        ids: Sequence[int],
+        names: Sequence[str],
+        models: Sequence[str],
+        years: Sequence[int],
+        colors: Sequence[str],
+        prices: Sequence[int],
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+    ) -> Self:
+        """Table over existing columns, e.g. ``memoryview`` casts of a mapped file.
+
+        The columns are used as is, without copying; such a table is read-only.
+        """
+        table = cls()
+        # Any buffer-like sequence works for reads, only ``append`` needs arrays and lists.
+        table.ids = ids  # type: ignore[assignment]
+        table.names = names  # type: ignore[assignment]
+        table.models = models  # type: ignore[assignment]
+        table.years = years  # type: ignore[assignment]
+        table.colors = colors  # type: ignore[assignment]
+        table.prices = prices  # type: ignore[assignment]
+        table.latitudes = latitudes  # type: ignore[assignment]
+        table.longitudes = longitudes  # type: ignore[assignment]
+        return table
+
+    def append(self, vehicle: Vehicle) -> None:
+        self.ids.append(self.NO_ID if vehicle.id is None else vehicle.id)
+        self.names.append(sys.intern(vehicle.name))
+        self.models.append(sys.intern(vehicle.model))
+        self.years.append(vehicle.year)
+        self.colors.append(sys.intern(vehicle.color))
+        self.prices.append(vehicle.price)
+        self.latitudes.append(vehicle.latitude)
+        self.longitudes.append(vehicle.longitude)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @overload
+    def __getitem__(self, index: int) -> Vehicle: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Vehicle]: ...
+
+    def __getitem__(self, index: int | slice) -> Vehicle | list[Vehicle]:
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("VehicleTable index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[Vehicle]:
+        return (self._row(i) for i in range(len(self)))
+
+    def _row(self, index: int) -> Vehicle:
+        vehicle_id = self.ids[index]
+        return Vehicle(
+            name=self.names[index],
+            model=self.models[index],
+            year=self.years[index],
+            color=self.colors[index],
+            price=self.prices[index],
+            latitude=self.latitudes[index],
+            longitude=self.longitudes[index],
+            id=None if vehicle_id == self.NO_ID else vehicle_id,
+        )
+
+
+@dataclass
+class BulkResult:
+    succeeded: list[Any] = field(default_factory=list)
+    failed: list[tuple[Any, Exception]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return len(self.succeeded) + len(self.failed)
+
+    @property
+    def throughput(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
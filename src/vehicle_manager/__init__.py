@@ -1,3 +1,15 @@
+from .api import create_session
 from .manager import VehicleManager
+from .metrics import CallbackMetrics, InMemoryMetrics, MetricsSink, PrometheusMetrics
+from .retry import CircuitBreaker, RetryPolicy
 
-__all__ = ("VehicleManager",)
+__all__ = (
+    "CallbackMetrics",
+    "CircuitBreaker",
+    "InMemoryMetrics",
+    "MetricsSink",
+    "PrometheusMetrics",
+    "RetryPolicy",
+    "VehicleManager",
+    "create_session",
+)
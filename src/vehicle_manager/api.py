@@ -1,85 +1,424 @@
-from typing import Any
+import codecs
+import json
+import threading
+import time
+from collections.abc import Callable, Generator, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any, NamedTuple
 
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
 
 from src import exeptions as e
+from src.models import Vehicle
+from src.vehicle_manager.codec import JSONCodec, get_codec
+from src.vehicle_manager.metrics import NULL_METRICS, MetricsSink
+from src.vehicle_manager.retry import CircuitBreaker, RetryPolicy
+
+
+class _CachedList(NamedTuple):
+    etag: str | None
+    last_modified: str | None
+    body: list[Any]
+
+
+class Transfer(NamedTuple):
+    encoding: str
+    wire_bytes: int
+    decoded_bytes: int
+
+
+@dataclass
+class TransferStats:
+    requests: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+
+    @property
+    def compression_ratio(self) -> float:
+        return self.decoded_bytes / self.wire_bytes if self.wire_bytes else 1.0
+
+    def record(self, transfer: Transfer) -> None:
+        self.requests += 1
+        self.wire_bytes += transfer.wire_bytes
+        self.decoded_bytes += transfer.decoded_bytes
+
+
+Timeout = float | tuple[float, float]
+
+# Every encoding urllib3 can decode here: gzip and deflate, plus br and zstd when
+# brotli / zstandard are installed.
+ACCEPT_ENCODING = ", ".join(urllib3.util.request.ACCEPT_ENCODING.split(","))
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def create_session(
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    pool_block: bool = False,
+    keep_alive: bool = True,
+) -> requests.Session:
+    """Session with a sized connection pool, can be shared by many ``API`` instances.
+
+    ``pool_connections`` is the number of hosts to keep pools for and ``pool_maxsize`` the
+    number of connections kept per host. With ``pool_block`` callers wait for a free
+    connection instead of opening extra ones that are discarded afterwards.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
 
 
 class API:
-    def __init__(self, url: str, timeout: int) -> None:
+    def __init__(
+        self,
+        url: str,
+        timeout: Timeout,
+        conditional_requests: bool = True,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        session: requests.Session | None = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        codec: JSONCodec | str | None = None,
+        compression: bool = True,
+        metrics: MetricsSink = NULL_METRICS,
+    ) -> None:
         self.url = url
         self.timeout = timeout
-        self.session = requests.Session()
+        # A session passed in is shared with other clients and stays open on ``close``.
+        self.owns_session = session is None
+        if session is None:
+            session = create_session(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+                keep_alive=keep_alive,
+            )
+        self.session = session
+        self.conditional_requests = conditional_requests
+        self.retry = retry or RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self.codec = codec if isinstance(codec, JSONCodec) else get_codec(codec)
+        self.metrics = metrics
+        self.accept_encoding = ACCEPT_ENCODING if compression else "identity"
+        self.last_transfer: Transfer | None = None
+        self.transfer_stats = TransferStats()
+        self._stats_lock = threading.Lock()
+        self._list_cache: dict[tuple, _CachedList] = {}
+
+    def close(self) -> None:
+        if self.owns_session:
+            self.session.close()
+
+    def _send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request, retrying connection errors and retryable statuses per ``self.retry``."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_call()
 
-    def get_list(self) -> list[dict[str, Any]]:
+        kwargs["headers"] = {"Accept-Encoding": self.accept_encoding, **kwargs.get("headers", {})}
+        attempt = 0
         try:
-            response = self.session.get(url=f"{self.url}/vehicles", timeout=self.timeout)
+            while True:
+                try:
+                    response = self._request(method, url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as err:
+                    if not self.retry.can_retry(method, attempt):
+                        raise e.VehicleManagerAPIError(str(err)) from err
+                    delay = self.retry.backoff(attempt)
+                except requests.RequestException as err:
+                    raise e.VehicleManagerAPIError(str(err)) from err
+                else:
+                    retryable = response.status_code in self.retry.status_forcelist
+                    if not retryable or not self.retry.can_retry(method, attempt):
+                        self._record_result(failed=retryable or response.status_code >= 500)
+                        return response
+                    delay = self.retry.backoff(attempt, response.headers.get("Retry-After"))
+                    response.close()
+                attempt += 1
+                time.sleep(delay)
+        except BaseException:
+            # Whatever went wrong, a half-open breaker must learn that its trial call failed.
+            self._record_result(failed=True)
+            raise
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        if not self.metrics.enabled:
+            return self.session.request(method, url, timeout=self.timeout, **kwargs)
+
+        endpoint = "/vehicles" if url == f"{self.url}/vehicles" else "/vehicles/{id}"
+        start = time.perf_counter()
+        status = "error"
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            status = str(response.status_code)
+            return response
+        finally:
+            self.metrics.observe(
+                "http_request_seconds",
+                time.perf_counter() - start,
+                method=method,
+                endpoint=endpoint,
+            )
+            self.metrics.increment(
+                "http_requests_total", method=method, endpoint=endpoint, status=status
+            )
+
+    def _read(self, response: requests.Response) -> bytes:
+        try:
+            content = response.content
+        except requests.RequestException as err:
+            raise e.VehicleManagerAPIError(str(err)) from err
+        self._record_transfer(response, len(content))
+        return content
+
+    def _iter_content(self, response: requests.Response, chunk_size: int) -> Iterator[bytes]:
+        """Decompresses on the fly, so parsing starts before the whole body has arrived."""
+        decoded_bytes = 0
+        try:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                decoded_bytes += len(chunk)
+                yield chunk
+        except requests.RequestException as err:
+            raise e.VehicleManagerAPIError(str(err)) from err
+        finally:
+            self._record_transfer(response, decoded_bytes)
+
+    def _record_transfer(self, response: requests.Response, decoded_bytes: int) -> None:
+        try:
+            wire_bytes = response.raw.tell()
+        except (AttributeError, OSError):
+            wire_bytes = decoded_bytes
+        encoding = response.headers.get("Content-Encoding", "identity")
+        self.last_transfer = Transfer(encoding, wire_bytes, decoded_bytes)
+        with self._stats_lock:
+            self.transfer_stats.record(self.last_transfer)
+        if self.metrics.enabled:
+            self.metrics.increment("http_wire_bytes_total", wire_bytes, encoding=encoding)
+            self.metrics.increment("http_decoded_bytes_total", decoded_bytes, encoding=encoding)
+
+    def _record_result(self, failed: bool) -> None:
+        if self.circuit_breaker is None:
+            return
+        if failed:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    def get_list(self, params: dict[str, Any] | None = None) -> list[dict[str, Any]]:
+        """On ``304 Not Modified`` the very same list object as before is returned."""
+        return self._get_list(params, self.codec.loads)
+
+    def get_vehicles(self, params: dict[str, Any] | None = None) -> list[Vehicle]:
+        """Like ``get_list`` but decoded straight into ``Vehicle`` objects by the codec."""
+        return self._get_list(params, self.codec.loads_vehicles)
+
+    def _get_list(
+        self, params: dict[str, Any] | None, decode: Callable[[bytes], list[Any]]
+    ) -> list[Any]:
+        cache_key = (decode.__name__, *sorted((params or {}).items()))
+        cached = self._list_cache.get(cache_key)
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        try:
+            response = self._send("GET", url=f"{self.url}/vehicles", params=params, headers=headers)
             response.raise_for_status()
         except requests.exceptions.HTTPError as err:
             raise e.VehicleManagerAPIError(str(err)) from err
 
+        content = self._read(response)
+        if response.status_code == 304 and cached is not None:
+            return cached.body
+
         try:
-            return response.json()  # type: ignore
-        except requests.JSONDecodeError as err:
+            with self.metrics.timer(
+                "decode_seconds", codec=self.codec.name, target=decode.__name__
+            ):
+                body = decode(content)
+        except ValueError as err:
+            raise e.VehiclesInavlidResponseError(str(err)) from err
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if self.conditional_requests and (etag or last_modified):
+            self._list_cache[cache_key] = _CachedList(etag, last_modified, body)
+        else:
+            self._list_cache.pop(cache_key, None)
+        return body
+
+    def is_revalidated(self, body: list[Any]) -> bool:
+        return any(cached.body is body for cached in self._list_cache.values())
+
+    def validators(self, body: list[Any]) -> tuple[str | None, str | None]:
+        """``ETag`` and ``Last-Modified`` the list ``body`` was received with, if cached."""
+        for cached in self._list_cache.values():
+            if cached.body is body:
+                return cached.etag, cached.last_modified
+        return None, None
+
+    def prime_vehicles(
+        self, vehicles: list[Vehicle], etag: str | None, last_modified: str | None
+    ) -> None:
+        """Revalidate the next ``get_vehicles`` against a fleet restored from elsewhere."""
+        if self.conditional_requests and (etag or last_modified):
+            cache_key = (self.codec.loads_vehicles.__name__,)
+            self._list_cache[cache_key] = _CachedList(etag, last_modified, vehicles)
+
+    def iter_list(
+        self, params: dict[str, Any] | None = None, chunk_size: int = 64 * 1024
+    ) -> Generator[dict[str, Any], None, None]:
+        try:
+            response = self._send("GET", url=f"{self.url}/vehicles", params=params, stream=True)
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as err:
+            raise e.VehicleManagerAPIError(str(err)) from err
+
+        with response:
+            try:
+                yield from _JSONArrayReader(self._iter_content(response, chunk_size))
+            except requests.RequestException as err:
+                raise e.VehicleManagerAPIError(str(err)) from err
+
+    def _decode(self, response: requests.Response) -> dict[str, Any]:
+        try:
+            content = self._read(response)
+            with self.metrics.timer("decode_seconds", codec=self.codec.name, target="loads"):
+                return self.codec.loads(content)  # type: ignore
+        except ValueError as err:
             raise e.VehiclesInavlidResponseError(str(err)) from err
 
     def get(self, vehicle_id: int) -> dict[str, Any]:
         try:
-            response = self.session.get(
-                url=f"{self.url}/vehicles/{vehicle_id}", timeout=self.timeout
-            )
+            response = self._send("GET", url=f"{self.url}/vehicles/{vehicle_id}")
             if response.status_code == 404:
                 raise e.VehicleNotFoundError(f"'Vehicle' object not found with id={vehicle_id}")
             response.raise_for_status()
         except requests.exceptions.HTTPError as err:
             raise e.VehicleManagerAPIError(str(err)) from err
 
-        try:
-            return response.json()  # type: ignore
-        except requests.JSONDecodeError as err:
-            raise e.VehiclesInavlidResponseError(str(err)) from err
+        return self._decode(response)
 
     def create(self, vehicle: dict[str, Any]) -> dict[str, Any]:
         try:
-            response = self.session.post(
+            response = self._send(
+                "POST",
                 url=f"{self.url}/vehicles",
-                json=vehicle,
-                timeout=self.timeout,
+                data=self.codec.dumps(vehicle),
+                headers=JSON_HEADERS,
             )
             response.raise_for_status()
         except requests.exceptions.HTTPError as err:
             raise e.VehicleManagerAPIError(str(err)) from err
 
-        try:
-            return response.json()  # type: ignore
-        except requests.JSONDecodeError as err:
-            raise e.VehiclesInavlidResponseError(str(err)) from err
+        return self._decode(response)
 
     def update(self, vehicle_id: int, vehicle: dict[str, Any]) -> dict[str, Any]:
         try:
-            response = self.session.put(
+            response = self._send(
+                "PUT",
                 url=f"{self.url}/vehicles/{vehicle_id}",
-                json=vehicle,
-                timeout=self.timeout,
+                data=self.codec.dumps(vehicle),
+                headers=JSON_HEADERS,
             )
             if response.status_code == 404:
                 raise e.VehicleNotFoundError(f"'Vehicle' object not found with id={vehicle_id}")
             response.raise_for_status()
         except requests.exceptions.HTTPError as err:
             raise e.VehicleManagerAPIError(str(err)) from err
-        try:
-            return response.json()  # type: ignore
-        except requests.JSONDecodeError as err:
-            raise e.VehiclesInavlidResponseError(str(err)) from err
+        return self._decode(response)
 
     def delete(self, vehicle_id: int) -> None:
         try:
-            response = self.session.delete(
-                url=f"{self.url}/vehicles/{vehicle_id}",
-                timeout=self.timeout,
-            )
+            response = self._send("DELETE", url=f"{self.url}/vehicles/{vehicle_id}")
             if response.status_code == 404:
                 raise e.VehicleNotFoundError(f"'Vehicle' object not found with id={vehicle_id}")
             response.raise_for_status()
         except requests.exceptions.HTTPError as err:
             raise e.VehicleManagerAPIError(str(err)) from err
+
+
+_WHITESPACE = " \t\n\r"
+
+
+class _JSONArrayReader:
+    """Yields the elements of a top-level JSON array of objects as the bytes arrive."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._exhausted = False
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        if (char := self._peek()) != "[":
+            raise e.VehiclesInavlidResponseError(f"Expected '[' but got {char!r}")
+        self._pos += 1
+        if self._peek() == "]":
+            self._pos += 1
+        else:
+            while True:
+                yield self._decode()
+                char = self._peek()
+                self._pos += 1
+                if char == "]":
+                    break
+                if char != ",":
+                    raise e.VehiclesInavlidResponseError(f"Expected ',' or ']' but got {char!r}")
+        if char := self._peek(end_ok=True):
+            raise e.VehiclesInavlidResponseError(f"Unexpected {char!r} after the vehicles list")
+
+    def _peek(self, end_ok: bool = False) -> str:
+        """Next non-whitespace character, or ``""`` at the end of the body if ``end_ok``."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                if end_ok:
+                    return ""
+                raise e.VehiclesInavlidResponseError("Unexpected end of the vehicles list")
+
+    def _decode(self) -> dict[str, Any]:
+        self._peek()
+        while True:
+            try:
+                value, self._pos = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as err:
+                # The object is most likely cut at a chunk boundary, retry with more data.
+                if not self._read():
+                    raise e.VehiclesInavlidResponseError(str(err)) from err
+                continue
+            if not isinstance(value, dict):
+                raise e.VehiclesInavlidResponseError(
+                    f"Expected a vehicle object but got {type(value).__name__}"
+                )
+            return value
+
+    def _read(self) -> bool:
+        if self._exhausted:
+            return False
+        chunk = next(self._chunks, None)
+        self._exhausted = chunk is None
+        self._buffer = self._buffer[self._pos :] + self._utf8.decode(
+            chunk or b"", final=self._exhausted
+        )
+        self._pos = 0
+        return True
@@ -0,0 +1,98 @@
+import asyncio
+from typing import Any
+
+import httpx
+
+from src import exeptions as e
+
+
+class AsyncAPI:
+    def __init__(
+        self,
+        url: str,
+        timeout: int,
+        max_connections: int = 100,
+        max_concurrency: int = 100,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.url = url
+        self.timeout = timeout
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            transport=transport,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def get_list(self) -> list[dict[str, Any]]:
+        try:
+            async with self._semaphore:
+                response = await self.client.get(url=f"{self.url}/vehicles")
+            response.raise_for_status()
+        except httpx.HTTPError as err:
+            raise e.VehicleManagerAPIError(str(err)) from err
+
+        try:
+            return response.json()  # type: ignore
+        except ValueError as err:
+            raise e.VehiclesInavlidResponseError(str(err)) from err
+
+    async def get(self, vehicle_id: int) -> dict[str, Any]:
+        try:
+            async with self._semaphore:
+                response = await self.client.get(url=f"{self.url}/vehicles/{vehicle_id}")
+            if response.status_code == 404:
+                raise e.VehicleNotFoundError(f"'Vehicle' object not found with id={vehicle_id}")
+            response.raise_for_status()
+        except httpx.HTTPError as err:
+            raise e.VehicleManagerAPIError(str(err)) from err
+
+        try:
+            return response.json()  # type: ignore
+        except ValueError as err:
+            raise e.VehiclesInavlidResponseError(str(err)) from err
+
+    async def create(self, vehicle: dict[str, Any]) -> dict[str, Any]:
+        try:
+            async with self._semaphore:
+                response = await self.client.post(url=f"{self.url}/vehicles", json=vehicle)
+            response.raise_for_status()
+        except httpx.HTTPError as err:
+            raise e.VehicleManagerAPIError(str(err)) from err
+
+        try:
+            return response.json()  # type: ignore
+        except ValueError as err:
+            raise e.VehiclesInavlidResponseError(str(err)) from err
+
+    async def update(self, vehicle_id: int, vehicle: dict[str, Any]) -> dict[str, Any]:
+        try:
+            async with self._semaphore:
+                response = await self.client.put(
+                    url=f"{self.url}/vehicles/{vehicle_id}", json=vehicle
+                )
+            if response.status_code == 404:
+                raise e.VehicleNotFoundError(f"'Vehicle' object not found with id={vehicle_id}")
+            response.raise_for_status()
+        except httpx.HTTPError as err:
+            raise e.VehicleManagerAPIError(str(err)) from err
+
+        try:
+            return response.json()  # type: ignore
+        except ValueError as err:
+            raise e.VehiclesInavlidResponseError(str(err)) from err
+
+    async def delete(self, vehicle_id: int) -> None:
+        try:
+            async with self._semaphore:
+                response = await self.client.delete(url=f"{self.url}/vehicles/{vehicle_id}")
+            if response.status_code == 404:
+                raise e.VehicleNotFoundError(f"'Vehicle' object not found with id={vehicle_id}")
+            response.raise_for_status()
+        except httpx.HTTPError as err:
+            raise e.VehicleManagerAPIError(str(err)) from err
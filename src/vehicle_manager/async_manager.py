@@ -0,0 +1,102 @@
+import asyncio
+from collections.abc import Iterable
+from dataclasses import asdict
+from types import TracebackType
+from typing import Self
+
+import httpx
+
+from src.models import Vehicle
+from src.vehicle_manager.async_api import AsyncAPI
+from src.vehicle_manager.distance import DISTANCE_FUNCTIONS, DistanceMode
+from src.vehicle_manager.spatial import scan_k_nearest
+
+
+class AsyncVehicleManager:
+    """Asyncio counterpart of ``VehicleManager`` backed by a pooled ``httpx.AsyncClient``.
+
+    ``max_concurrency`` bounds the number of requests in flight at once.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: int = 5,
+        distance_mode: DistanceMode = DistanceMode.COSINE,
+        max_connections: int = 100,
+        max_concurrency: int = 100,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.api = AsyncAPI(
+            url=url,
+            timeout=timeout,
+            max_connections=max_connections,
+            max_concurrency=max_concurrency,
+            transport=transport,
+        )
+        self.distance_mode = DistanceMode(distance_mode)
+        self._distance = DISTANCE_FUNCTIONS[self.distance_mode]
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.api.aclose()
+
+    async def get_vehicles(self) -> list[Vehicle]:
+        response = await self.api.get_list()
+        return [Vehicle.parse(data=value) for value in response]
+
+    async def get_vehicle(self, vehicle_id: int) -> Vehicle:
+        response = await self.api.get(vehicle_id=vehicle_id)
+        return Vehicle.parse(data=response)
+
+    async def get_vehicles_by_ids(self, ids: Iterable[int]) -> list[Vehicle]:
+        return await asyncio.gather(
+            *(self.get_vehicle(vehicle_id=vehicle_id) for vehicle_id in dict.fromkeys(ids))
+        )
+
+    async def add_vehicle(self, vehicle: Vehicle) -> Vehicle:
+        data = asdict(vehicle)
+        data.pop("id", None)
+        response = await self.api.create(vehicle=data)
+        return Vehicle.parse(data=response)
+
+    async def update_vehicle(self, vehicle: Vehicle) -> Vehicle:
+        if not vehicle.id:
+            raise ValueError("'Vehicle' object attribute 'id' must be not None")
+
+        response = await self.api.update(vehicle_id=vehicle.id, vehicle=asdict(vehicle))
+        return Vehicle.parse(data=response)
+
+    async def delete_vehicle(self, vehicle_id: int) -> None:
+        await self.api.delete(vehicle_id=vehicle_id)
+
+    async def get_distance(self, id1: int, id2: int) -> float:
+        vehicles = {vehicle.id: vehicle for vehicle in await self.get_vehicles_by_ids([id1, id2])}
+        vehicle1, vehicle2 = vehicles[id1], vehicles[id2]
+        return self._distance(
+            vehicle1.latitude, vehicle1.longitude, vehicle2.latitude, vehicle2.longitude
+        )
+
+    async def get_nearest_vehicle(self, vehicle_id: int) -> Vehicle | None:
+        cur_vehicle, vehicles = await asyncio.gather(
+            self.get_vehicle(vehicle_id=vehicle_id), self.get_vehicles()
+        )
+        # A one-off query: a linear scan beats building an index for it.
+        nearest = scan_k_nearest(
+            vehicles,
+            latitude=cur_vehicle.latitude,
+            longitude=cur_vehicle.longitude,
+            k=1,
+            exclude=lambda v: v == cur_vehicle,
+        )
+        return nearest[0][0] if nearest else None
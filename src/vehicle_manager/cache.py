@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import NamedTuple
+
+from src.models import Vehicle
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class FleetCache:
+    """Snapshot of the whole fleet kept for ``ttl`` seconds.
+
+    A ``ttl`` of zero disables caching; fleets larger than ``max_size`` are never stored.
+    The list and its expiry are swapped as one tuple, so ``get`` needs no lock.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 0,
+        max_size: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._entry: tuple[list[Vehicle], float] | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self) -> list[Vehicle] | None:
+        entry = self._entry
+        if entry is None or self._clock() >= entry[1]:
+            return None
+        return entry[0]
+
+    def accepts(self, size: int) -> bool:
+        return self.enabled and (self.max_size is None or size <= self.max_size)
+
+    def set(self, vehicles: list[Vehicle]) -> None:
+        if not self.accepts(len(vehicles)):
+            self.invalidate()
+            return
+        self._entry = (vehicles, self._clock() + self.ttl)
+
+    def invalidate(self) -> None:
+        self._entry = None
+
+
+class VehicleCache:
+    """Bounded LRU of vehicles keyed by id, a ``maxsize`` of zero disables it.
+
+    Every operation holds a lock, since reads reorder the LRU too. Vehicles are copied in
+    and out, so callers mutating them do not change the cached entries.
+    """
+
+    def __init__(self, maxsize: int = 0) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._vehicles: OrderedDict[int, Vehicle] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, vehicle_id: int) -> Vehicle | None:
+        with self._lock:
+            if (vehicle := self._vehicles.get(vehicle_id)) is None:
+                self.misses += 1
+                return None
+            self._vehicles.move_to_end(vehicle_id)
+            self.hits += 1
+            return vehicle.copy()
+
+    def put(self, vehicle: Vehicle) -> None:
+        if self.maxsize <= 0 or vehicle.id is None:
+            return
+        with self._lock:
+            self._put(vehicle.id, vehicle)
+
+    def put_many(self, vehicles: Iterable[Vehicle]) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            for vehicle in vehicles:
+                if vehicle.id is not None:
+                    self._put(vehicle.id, vehicle)
+
+    def _put(self, vehicle_id: int, vehicle: Vehicle) -> None:
+        self._vehicles[vehicle_id] = vehicle.copy()
+        self._vehicles.move_to_end(vehicle_id)
+        if len(self._vehicles) > self.maxsize:
+            self._vehicles.popitem(last=False)
+
+    def pop(self, vehicle_id: int) -> None:
+        with self._lock:
+            self._vehicles.pop(vehicle_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vehicles.clear()
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._vehicles))
@@ -0,0 +1,97 @@
+import json
+from typing import Any
+
+from src.models import Vehicle
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None  # type: ignore
+
+
+class JSONCodec:
+    """Standard library codec, always available.
+
+    Decoding errors are raised as ``ValueError`` by every codec.
+    """
+
+    name = "json"
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def loads_vehicles(self, data: bytes) -> list[Vehicle]:
+        # A comprehension over the decoded list beats building vehicles in ``object_hook``.
+        try:
+            return [Vehicle.parse(data=value) for value in _expect_list(self.loads(data))]
+        except TypeError as err:
+            raise ValueError(str(err)) from err
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value)  # type: ignore
+
+
+class MsgspecCodec(JSONCodec):
+    """Decodes straight into typed ``Vehicle`` objects, validating field types on the way."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        self._decoder = msgspec.json.Decoder()
+        self._vehicles_decoder = msgspec.json.Decoder(list[Vehicle])
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as err:
+            raise ValueError(str(err)) from err
+
+    def dumps(self, value: Any) -> bytes:
+        return self._encoder.encode(value)  # type: ignore
+
+    def loads_vehicles(self, data: bytes) -> list[Vehicle]:
+        try:
+            return self._vehicles_decoder.decode(data)  # type: ignore
+        except msgspec.DecodeError as err:
+            raise ValueError(str(err)) from err
+
+
+CODECS: dict[str, type[JSONCodec]] = {"json": JSONCodec}
+if orjson is not None:
+    CODECS["orjson"] = OrjsonCodec
+if msgspec is not None:
+    CODECS["msgspec"] = MsgspecCodec
+
+# Fastest first.
+_PREFERENCE = ("msgspec", "orjson", "json")
+
+
+def get_codec(name: str | None = None) -> JSONCodec:
+    """Codec by name or, without a name, the fastest one installed."""
+    if name is None:
+        name = next(codec for codec in _PREFERENCE if codec in CODECS)
+    if name not in CODECS:
+        raise ValueError(f"JSON codec {name!r} is not available, choose from {sorted(CODECS)}")
+    return CODECS[name]()
+
+
+def _expect_list(value: Any) -> list[Any]:
+    if not isinstance(value, list):
+        raise ValueError(f"Expected a list of vehicles, received {type(value).__name__}")
+    return value
@@ -0,0 +1,110 @@
+import math
+from collections.abc import Callable
+from enum import StrEnum
+
+EARTH_RADIUS = 6371 * 1000
+
+# WGS-84 ellipsoid used by Vincenty's formulae.
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+
+DistanceFunc = Callable[[float, float, float, float], float]
+
+
+class DistanceMode(StrEnum):
+    COSINE = "cosine"
+    HAVERSINE = "haversine"
+    EQUIRECTANGULAR = "equirectangular"
+    VINCENTY = "vincenty"
+
+
+def spherical_cosine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    cosine = math.sin(phi1) * math.sin(phi2) + math.cos(phi1) * math.cos(phi2) * math.cos(
+        math.radians(lon2 - lon1)
+    )
+    # Rounding may push the cosine slightly outside [-1, 1] for (near) identical points.
+    return math.acos(max(-1.0, min(1.0, cosine))) * EARTH_RADIUS
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    h = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(min(1.0, h)))
+
+
+def equirectangular(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Flat-earth approximation: accurate for short distances, cheap enough for ranking."""
+    delta_lon = (lon2 - lon1 + 180) % 360 - 180
+    x = math.radians(delta_lon) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return math.hypot(x, y) * EARTH_RADIUS
+
+
+def vincenty(
+    lat1: float,
+    lon1: float,
+    lat2: float,
+    lon2: float,
+    max_iterations: int = 200,
+    tolerance: float = 1e-12,
+) -> float:
+    """Distance on the WGS-84 ellipsoid, falls back to haversine for nearly antipodal points."""
+    u1 = math.atan((1 - WGS84_F) * math.tan(math.radians(lat1)))
+    u2 = math.atan((1 - WGS84_F) * math.tan(math.radians(lat2)))
+    sin_u1, cos_u1 = math.sin(u1), math.cos(u1)
+    sin_u2, cos_u2 = math.sin(u2), math.cos(u2)
+    delta_lon = math.radians(lon2 - lon1)
+
+    lam = delta_lon
+    for _ in range(max_iterations):
+        sin_lam, cos_lam = math.sin(lam), math.cos(lam)
+        sin_sigma = math.hypot(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+        if sin_sigma == 0:
+            return 0.0
+        cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+        sigma = math.atan2(sin_sigma, cos_sigma)
+        sin_alpha = cos_u1 * cos_u2 * sin_lam / sin_sigma
+        cos2_alpha = 1 - sin_alpha**2
+        cos_2sigma_m = cos_sigma - 2 * sin_u1 * sin_u2 / cos2_alpha if cos2_alpha else 0.0
+        c = WGS84_F / 16 * cos2_alpha * (4 + WGS84_F * (4 - 3 * cos2_alpha))
+        prev_lam = lam
+        lam = delta_lon + (1 - c) * WGS84_F * sin_alpha * (
+            sigma + c * sin_sigma * (cos_2sigma_m + c * cos_sigma * (-1 + 2 * cos_2sigma_m**2))
+        )
+        if abs(lam - prev_lam) < tolerance:
+            break
+    else:
+        return haversine(lat1, lon1, lat2, lon2)
+
+    u_sq = cos2_alpha * (WGS84_A**2 - WGS84_B**2) / WGS84_B**2
+    a = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+    b = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+    delta_sigma = (
+        b
+        * sin_sigma
+        * (
+            cos_2sigma_m
+            + b
+            / 4
+            * (
+                cos_sigma * (-1 + 2 * cos_2sigma_m**2)
+                - b / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma**2) * (-3 + 4 * cos_2sigma_m**2)
+            )
+        )
+    )
+    return WGS84_B * a * (sigma - delta_sigma)
+
+
+DISTANCE_FUNCTIONS: dict[DistanceMode, DistanceFunc] = {
+    DistanceMode.COSINE: spherical_cosine,
+    DistanceMode.HAVERSINE: haversine,
+    DistanceMode.EQUIRECTANGULAR: equirectangular,
+    DistanceMode.VINCENTY: vincenty,
+}
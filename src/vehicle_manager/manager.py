@@ -1,88 +1,493 @@
-import math
-from dataclasses import asdict, fields
-from typing import Any
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import asdict
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Self
 
-from src.models import Vehicle
-from src.vehicle_manager.api import API
+import requests
+
+from src.exeptions import BaseVehicleError, VehicleManagerAPIError
+from src.models import BulkResult, Vehicle, VehicleTable
+from src.vehicle_manager.api import API, Timeout, TransferStats
+from src.vehicle_manager.cache import CacheInfo, FleetCache, VehicleCache
+from src.vehicle_manager.codec import JSONCodec
+from src.vehicle_manager.distance import DISTANCE_FUNCTIONS, DistanceMode, spherical_cosine
+from src.vehicle_manager.metrics import NULL_METRICS, MetricsSink, instrument, timed
+from src.vehicle_manager.persistence import load_snapshot, save_snapshot
+from src.vehicle_manager.query import PUSHDOWN_PROBES, parse_params, pushdown_params
+from src.vehicle_manager.retry import CircuitBreaker, RetryPolicy
+from src.vehicle_manager.singleflight import SingleFlight
+from src.vehicle_manager.snapshot import FleetSnapshot
+from src.vehicle_manager.spatial import scan_k_nearest, scan_within_radius
+
+logger = logging.getLogger(__name__)
+
+_FLEET = "fleet"
+_VEHICLE = "vehicle"
 
 
 class VehicleManager:
-    def __init__(self, url: str, timeout: int = 5) -> None:
-        self.api = API(url=url, timeout=timeout)
+    """Client of the vehicles API with optional caching and local indexes.
+
+    A manager is thread-safe and meant to be shared by all worker threads, so they reuse
+    one connection pool: size it with ``pool_maxsize`` (at least the number of threads) and
+    set ``pool_block`` to queue requests instead of opening throwaway connections. Cached
+    fleet reads are lock-free, concurrent identical requests are coalesced, and per-id cache
+    and index queries hold short locks.
+
+    With ``snapshot_path`` every fleet received from the server is saved to that file. A new
+    manager maps the file on start, answers from it at once and revalidates it against the
+    server in the background (see ``revalidation``); pair it with ``cache_ttl``.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: Timeout = 5,
+        distance_mode: DistanceMode = DistanceMode.COSINE,
+        cache_ttl: float = 0,
+        cache_max_size: int | None = None,
+        vehicle_cache_size: int = 0,
+        max_workers: int = 8,
+        server_filters: bool = False,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        session: requests.Session | None = None,
+        pool_connections: int = 10,
+        pool_maxsize: int | None = None,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        codec: JSONCodec | str | None = None,
+        compression: bool = True,
+        metrics: MetricsSink = NULL_METRICS,
+        snapshot_path: str | os.PathLike[str] | None = None,
+    ) -> None:
+        self.metrics = metrics
+        self.api = API(
+            url=url,
+            timeout=timeout,
+            retry=retry,
+            circuit_breaker=circuit_breaker,
+            session=session,
+            pool_connections=pool_connections,
+            # Every worker thread of ``get_vehicles_by_ids`` may hold a connection at once.
+            pool_maxsize=pool_maxsize or max(10, max_workers),
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+            codec=codec,
+            compression=compression,
+            metrics=metrics,
+        )
+        self.distance_mode = DistanceMode(distance_mode)
+        self._distance = DISTANCE_FUNCTIONS[self.distance_mode]
+        self._fleet_cache = FleetCache(ttl=cache_ttl, max_size=cache_max_size)
+        self._vehicle_cache = VehicleCache(maxsize=vehicle_cache_size)
+        self.snapshot = FleetSnapshot()
+        self._last_list: list[Vehicle] | None = None
+        # Whether ``snapshot`` holds the fleet, only kept up to date while something reads it.
+        self._indexed = False
+        self.max_workers = max_workers
+        self.server_filters = server_filters
+        self._server_filter_fields: frozenset[str] | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._flight = SingleFlight()
+        self._generation = 0
+        self._executor_lock = threading.Lock()
+        self.snapshot_path = Path(snapshot_path) if snapshot_path is not None else None
+        self.revalidation: Future[list[Vehicle]] | None = None
+        self._unsaved: tuple[list[Vehicle], str | None, str | None] | None = None
+        self._save_lock = threading.Lock()
+        instrument(self, metrics)
+        if self.snapshot_path is not None:
+            self._warm_start(self.snapshot_path)
 
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.api.close()
+
+    @timed("get_vehicles")
     def get_vehicles(self) -> list[Vehicle]:
-        response = self.api.get_list()
-        return [Vehicle.parse(data=value) for value in response]
+        # The list is shared with the fleet cache and later 304 responses, hand out copies.
+        return [vehicle.copy() for vehicle in self._get_snapshot()]
+
+    @timed("get_vehicle_table")
+    def get_vehicle_table(self) -> VehicleTable:
+        if (vehicles := self._fleet_cache.get()) is not None:
+            return VehicleTable.from_vehicles(vehicles)
+        return VehicleTable.from_records(self.api.iter_list())
+
+    def iter_vehicles(self) -> Iterator[Vehicle]:
+        return self._iter_vehicles()
+
+    def _iter_vehicles(self, params: dict[str, Any] | None = None) -> Iterator[Vehicle]:
+        generation = self._generation
+        cached = self._vehicle_cache.maxsize > 0
+        for value in self.api.iter_list(params=params):
+            vehicle = Vehicle.parse(data=value)
+            if cached:
+                self._cache_vehicles((vehicle,), generation)
+            yield vehicle
+
+    def invalidate_cache(self) -> None:
+        self._invalidate_fleet()
+        self._vehicle_cache.clear()
 
+    def vehicle_cache_info(self) -> CacheInfo:
+        return self._vehicle_cache.info()
+
+    def transfer_stats(self) -> TransferStats:
+        """Bytes received over the wire and after decompression, summed over all responses."""
+        return self.api.transfer_stats
+
+    def _get_snapshot(self) -> list[Vehicle]:
+        vehicles = self._fleet_cache.get()
+        if self._fleet_cache.enabled:
+            self._count_cache("fleet", hit=vehicles is not None)
+        if vehicles is not None:
+            return vehicles
+        # Concurrent callers share one request, e.g. right after the cache expires.
+        return self._flight.do(_FLEET, self._load_snapshot)
+
+    def _load_snapshot(self) -> list[Vehicle]:
+        generation = self._generation
+        vehicles = self.api.get_vehicles()
+        with self.snapshot.lock:
+            if generation != self._generation:
+                # A write landed while the list was in flight, do not cache what it predates.
+                return vehicles
+            # Not modified since the last request: keep the snapshot and its indexes.
+            changed = vehicles is not self._last_list
+            self._last_list = vehicles if self.api.is_revalidated(vehicles) else None
+            if changed or not self._indexed:
+                self._index_snapshot(vehicles)
+            if changed and self.snapshot_path is not None:
+                self._unsaved = (vehicles, *self.api.validators(vehicles))
+                self._get_executor().submit(self._save_snapshot, self.snapshot_path)
+            self._fleet_cache.set(vehicles)
+            self._vehicle_cache.put_many(vehicles)
+        return vehicles
+
+    def _index_snapshot(self, vehicles: list[Vehicle]) -> None:
+        # Queries only use the snapshot while the fleet fits the cache; without subscribers
+        # either, its copies and indexes would only take memory.
+        if self._fleet_cache.accepts(len(vehicles)) or self.snapshot.subscribed:
+            with self.metrics.timer("snapshot_apply_seconds"):
+                self.snapshot.apply(vehicles)
+            self._indexed = True
+        elif self._indexed:
+            self.snapshot.clear()
+            self._indexed = False
+
+    def _cache_vehicles(self, vehicles: Iterable[Vehicle], generation: int) -> None:
+        # Read before a write landed: caching it could shadow the written vehicle.
+        with self.snapshot.lock:
+            if generation == self._generation:
+                self._vehicle_cache.put_many(vehicles)
+
+    def _warm_start(self, path: Path) -> None:
+        try:
+            saved = load_snapshot(path)
+        except (OSError, ValueError):
+            # Missing or unreadable: start cold, the first read fetches the fleet.
+            return
+        vehicles = list(saved.table)
+        self.api.prime_vehicles(vehicles, etag=saved.etag, last_modified=saved.last_modified)
+        with self.snapshot.lock:
+            self._last_list = vehicles if self.api.is_revalidated(vehicles) else None
+            self._index_snapshot(vehicles)
+            self._fleet_cache.set(vehicles)
+        self._vehicle_cache.put_many(vehicles)
+        self.revalidation = self._get_executor().submit(
+            self._flight.do, _FLEET, self._load_snapshot
+        )
+
+    def _save_snapshot(self, path: Path) -> None:
+        with self._save_lock:
+            # Saves queued behind this one find nothing left: the newest fleet is written once.
+            with self.snapshot.lock:
+                unsaved, self._unsaved = self._unsaved, None
+            if unsaved is None:
+                return
+            vehicles, etag, last_modified = unsaved
+            try:
+                save_snapshot(path, vehicles, etag=etag, last_modified=last_modified)
+            except Exception:
+                # Runs in the executor with nobody waiting for the result, so an I/O error or
+                # a value the columns can't hold (e.g. a float price) would otherwise vanish.
+                logger.exception("Failed to save the fleet snapshot to %s", path)
+
+    @timed("filter_vehicles")
     def filter_vehicles(self, params: dict[str, Any]) -> list[Vehicle]:
-        fields_vehicle = {field.name: field.type for field in fields(Vehicle)}
-
-        if error_attrs := set(params).difference(set(fields_vehicle)):
-            raise AttributeError(f"'Vehicle' object has no attributes: {error_attrs}")
-        for key, value in params.items():
-            if not isinstance(value, fields_vehicle[key]):
-                raise TypeError(
-                    f"'Vehicle.{key}' has type {fields_vehicle[key]} received {type(value)}"
-                )
+        """Supports equality, ``field__in`` and ``field__lt/lte/gt/gte`` predicates."""
+        predicates = parse_params(params)
 
-        result = []
-        for vehicle in self.get_vehicles():
-            for key, value in params.items():
-                if getattr(vehicle, key) != value:
-                    break
-            else:
-                result.append(vehicle)
+        if self._fleet_cache.enabled:
+            vehicles = self._get_snapshot()
+            with self.snapshot.lock:
+                if self._indexed:
+                    return self.snapshot.select(predicates)
+            return [
+                vehicle.copy()
+                for vehicle in vehicles
+                if all(predicate.matches(vehicle) for predicate in predicates)
+            ]
 
-        return result
+        server_params: dict[str, Any] = {}
+        if self.server_filters:
+            server_params = pushdown_params(predicates, self.probe_server_filters())
+        return [
+            vehicle
+            for vehicle in self._iter_vehicles(params=server_params or None)
+            if all(predicate.matches(vehicle) for predicate in predicates)
+        ]
+
+    def probe_server_filters(self) -> frozenset[str]:
+        """Fields the backend filters ``GET /vehicles`` by, detected once with sentinel values."""
+        if self._server_filter_fields is not None:
+            return self._server_filter_fields
+        if not self._has_rows(params=None):
+            # An empty fleet can't tell a filtering backend from one ignoring the parameters.
+            return frozenset()
+
+        supported = set()
+        for field, value in PUSHDOWN_PROBES.items():
+            try:
+                if not self._has_rows(params={field: value}):
+                    supported.add(field)
+            except VehicleManagerAPIError:
+                continue
+        self._server_filter_fields = frozenset(supported)
+        return self._server_filter_fields
 
+    def _has_rows(self, params: dict[str, Any] | None) -> bool:
+        with closing(self.api.iter_list(params=params)) as rows:
+            return next(rows, None) is not None
+
+    @timed("get_vehicle")
     def get_vehicle(self, vehicle_id: int) -> Vehicle:
+        if (vehicle := self._get_cached_vehicle(vehicle_id)) is not None:
+            return vehicle
+        return self._fetch_vehicle(vehicle_id)
+
+    @timed("get_vehicles_by_ids")
+    def get_vehicles_by_ids(self, ids: Iterable[int]) -> list[Vehicle]:
+        unique_ids = list(dict.fromkeys(ids))
+        cached = {}
+        for vehicle_id in unique_ids:
+            if (vehicle := self._get_cached_vehicle(vehicle_id)) is not None:
+                cached[vehicle_id] = vehicle
+
+        missing = [vehicle_id for vehicle_id in unique_ids if vehicle_id not in cached]
+        if len(missing) == 1:
+            fetched = [self._fetch_vehicle(missing[0])]
+        elif missing:
+            fetched = list(self._get_executor().map(self._fetch_vehicle, missing))
+        else:
+            fetched = []
+
+        by_id = cached | dict(zip(missing, fetched, strict=True))
+        return [by_id[vehicle_id] for vehicle_id in unique_ids]
+
+    def _get_cached_vehicle(self, vehicle_id: int) -> Vehicle | None:
+        vehicle = self._vehicle_cache.get(vehicle_id)
+        if self._vehicle_cache.maxsize > 0:
+            self._count_cache("vehicle", hit=vehicle is not None)
+        return vehicle
+
+    def _count_cache(self, cache: str, hit: bool) -> None:
+        if self.metrics.enabled:
+            self.metrics.increment(
+                "cache_requests_total", cache=cache, result="hit" if hit else "miss"
+            )
+
+    def _fetch_vehicle(self, vehicle_id: int) -> Vehicle:
+        return self._flight.do((_VEHICLE, vehicle_id), lambda: self._load_vehicle(vehicle_id))
+
+    def _load_vehicle(self, vehicle_id: int) -> Vehicle:
+        generation = self._generation
         response = self.api.get(vehicle_id=vehicle_id)
-        return Vehicle.parse(data=response)
+        vehicle = Vehicle.parse(data=response)
+        self._cache_vehicles((vehicle,), generation)
+        return vehicle
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="vehicle-manager"
+                )
+            return self._executor
 
+    @timed("add_vehicle")
     def add_vehicle(self, vehicle: Vehicle) -> Vehicle:
         data = asdict(vehicle)
         data.pop("id", None)
         response = self.api.create(vehicle=data)
-        return Vehicle.parse(data=response)
+        self._invalidate_fleet()
+        created = Vehicle.parse(data=response)
+        self._vehicle_cache.put(created)
+        if self._indexed or self.snapshot.subscribed:
+            self.snapshot.upsert(created)
+        return created
 
+    @timed("update_vehicle")
     def update_vehicle(self, vehicle: Vehicle) -> Vehicle:
         if not vehicle.id:
             raise ValueError("'Vehicle' object attribute 'id' must be not None")
 
         response = self.api.update(vehicle_id=vehicle.id, vehicle=asdict(vehicle))
-        return Vehicle.parse(data=response)
+        self._invalidate_fleet(vehicle.id)
+        updated = Vehicle.parse(data=response)
+        self._vehicle_cache.put(updated)
+        if self._indexed or self.snapshot.subscribed:
+            self.snapshot.upsert(updated)
+        return updated
 
+    @timed("delete_vehicle")
     def delete_vehicle(self, vehicle_id: int) -> None:
         self.api.delete(vehicle_id=vehicle_id)
+        self._invalidate_fleet(vehicle_id)
+        # After the request: a read racing the delete may have cached the vehicle meanwhile.
+        self._vehicle_cache.pop(vehicle_id)
+        if self._indexed or self.snapshot.subscribed:
+            self.snapshot.discard(vehicle_id)
+
+    def _invalidate_fleet(self, vehicle_id: int | None = None) -> None:
+        with self.snapshot.lock:
+            self._generation += 1
+            self._fleet_cache.invalidate()
+        self._flight.forget(_FLEET)
+        if vehicle_id is not None:
+            self._flight.forget((_VEHICLE, vehicle_id))
+
+    @timed("add_vehicles")
+    def add_vehicles(self, vehicles: Iterable[Vehicle]) -> BulkResult:
+        return self._run_bulk(self.add_vehicle, vehicles)
+
+    @timed("update_vehicles")
+    def update_vehicles(self, vehicles: Iterable[Vehicle]) -> BulkResult:
+        return self._run_bulk(self.update_vehicle, vehicles)
 
+    @timed("delete_vehicles")
+    def delete_vehicles(self, vehicle_ids: Iterable[int]) -> BulkResult:
+        def delete(vehicle_id: int) -> int:
+            self.delete_vehicle(vehicle_id=vehicle_id)
+            return vehicle_id
+
+        return self._run_bulk(delete, vehicle_ids)
+
+    def _run_bulk(self, func: Callable[[Any], Any], items: Iterable[Any]) -> BulkResult:
+        result = BulkResult()
+        started = time.perf_counter()
+        executor = self._get_executor()
+        futures = [(item, executor.submit(func, item)) for item in items]
+        for item, future in futures:
+            try:
+                result.succeeded.append(future.result())
+            except (BaseVehicleError, ValueError) as err:
+                result.failed.append((item, err))
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    @timed("get_distance")
     def get_distance(self, id1: int, id2: int) -> float:
-        vehicle1 = self.get_vehicle(vehicle_id=id1)
-        vehicle2 = self.get_vehicle(vehicle_id=id2)
-        return self._calculate_distance(vehicle1, vehicle2)
+        vehicles = {vehicle.id: vehicle for vehicle in self.get_vehicles_by_ids([id1, id2])}
+        vehicle1, vehicle2 = vehicles[id1], vehicles[id2]
+        return self._distance(
+            vehicle1.latitude, vehicle1.longitude, vehicle2.latitude, vehicle2.longitude
+        )
 
+    @timed("get_nearest_vehicle")
     def get_nearest_vehicle(self, vehicle_id: int) -> Vehicle | None:
         cur_vehicle = self.get_vehicle(vehicle_id=vehicle_id)
-        vehicles = self.get_vehicles()
-        if len(vehicles) == 1:
-            return None
-        nearest_vehicle = min(
-            (vehicle for vehicle in vehicles if vehicle != cur_vehicle),
-            key=lambda v: self._calculate_distance(cur_vehicle, v),
+        nearest = self._k_nearest(
+            latitude=cur_vehicle.latitude,
+            longitude=cur_vehicle.longitude,
+            k=1,
+            exclude=lambda v: v == cur_vehicle,
         )
-        return nearest_vehicle
+        return nearest[0][0] if nearest else None
+
+    @timed("get_k_nearest")
+    def get_k_nearest(self, point_or_id: int | tuple[float, float], k: int) -> list[Vehicle]:
+        latitude, longitude, exclude = self._resolve_point(point_or_id)
+        nearest = self._k_nearest(latitude=latitude, longitude=longitude, k=k, exclude=exclude)
+        return [vehicle for vehicle, _ in nearest]
+
+    @timed("get_within_radius")
+    def get_within_radius(self, point: tuple[float, float], meters: float) -> list[Vehicle]:
+        latitude, longitude = point
+        vehicles = self._get_snapshot() if self._fleet_cache.enabled else None
+        if vehicles is not None:
+            with self.snapshot.lock:
+                if self._indexed:
+                    with self.metrics.timer("spatial_query_seconds", query="within_radius"):
+                        found = self.snapshot.within_radius(
+                            latitude=latitude, longitude=longitude, meters=meters
+                        )
+                    return [vehicle for vehicle, _ in found]
+        found = scan_within_radius(
+            vehicles if vehicles is not None else self.iter_vehicles(),
+            latitude=latitude,
+            longitude=longitude,
+            meters=meters,
+        )
+        return [vehicle.copy() for vehicle, _ in found]
+
+    def _k_nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int,
+        exclude: Callable[[Vehicle], bool] | None,
+    ) -> list[tuple[Vehicle, float]]:
+        vehicles = self._get_snapshot() if self._fleet_cache.enabled else None
+        if vehicles is not None:
+            with self.snapshot.lock:
+                if self._indexed:
+                    with self.metrics.timer("spatial_query_seconds", query="k_nearest"):
+                        return self.snapshot.k_nearest(
+                            latitude=latitude, longitude=longitude, k=k, exclude=exclude
+                        )
+        found = scan_k_nearest(
+            vehicles if vehicles is not None else self.iter_vehicles(),
+            latitude=latitude,
+            longitude=longitude,
+            k=k,
+            exclude=exclude,
+        )
+        return [(vehicle.copy(), distance) for vehicle, distance in found]
+
+    def _resolve_point(
+        self, point_or_id: int | tuple[float, float]
+    ) -> tuple[float, float, Callable[[Vehicle], bool] | None]:
+        if isinstance(point_or_id, int):
+            cur_vehicle = self.get_vehicle(vehicle_id=point_or_id)
+            return cur_vehicle.latitude, cur_vehicle.longitude, lambda v: v.id == cur_vehicle.id
+        latitude, longitude = point_or_id
+        return latitude, longitude, None
 
     @staticmethod
     def _calculate_distance(vehicle1: Vehicle, vehicle2: Vehicle) -> float:
-        distance = (
-            math.acos(
-                math.sin(math.radians(vehicle1.latitude))
-                * math.sin(math.radians(vehicle2.latitude))
-                + math.cos(math.radians(vehicle1.latitude))
-                * math.cos(math.radians(vehicle2.latitude))
-                * math.cos(math.radians(vehicle2.longitude - vehicle1.longitude))
-            )
-            * 6371
-            * 1000
+        return spherical_cosine(
+            vehicle1.latitude, vehicle1.longitude, vehicle2.latitude, vehicle2.longitude
         )
-
-        return distance  # type: ignore
@@ -0,0 +1,229 @@
+import functools
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Protocol, TypeVar
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tuple[tuple[str, str], ...]
+
+_NULL_TIMER = nullcontext()
+
+
+class MetricsSink:
+    """Sink that drops everything; the base class of the real sinks.
+
+    Instrumented code checks ``enabled`` (or uses ``timer``, which returns a shared no-op
+    context) so that a disabled sink costs no clock reads and no allocations.
+    """
+
+    enabled = False
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        pass
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        pass
+
+    def timer(self, name: str, **labels: str) -> AbstractContextManager[object]:
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timer(name, labels)
+
+    @contextmanager
+    def _timer(self, name: str, labels: dict[str, str]) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+
+NULL_METRICS = MetricsSink()
+
+
+@dataclass
+class Histogram:
+    buckets: tuple[float, ...]
+    counts: list[int] = field(init=False)
+    count: int = 0
+    sum: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.counts = [0] * len(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile, ``inf`` past the last one."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts, strict=True):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class InMemoryMetrics(MetricsSink):
+    """Counters and fixed-bucket histograms kept in process, safe to share between threads."""
+
+    enabled = True
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counters: dict[str, dict[Labels, float]] = {}
+        self.histograms: dict[str, dict[Labels, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram(self.buckets)
+            series[key].observe(value)
+
+    def counter(self, name: str, **labels: str) -> float:
+        return self.counters.get(name, {}).get(tuple(sorted(labels.items())), 0)
+
+    def histogram(self, name: str, **labels: str) -> Histogram | None:
+        return self.histograms.get(name, {}).get(tuple(sorted(labels.items())))
+
+    def clear(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+class PrometheusMetrics(InMemoryMetrics):
+    """In-memory sink that renders the Prometheus text exposition format."""
+
+    def __init__(self, namespace: str = "vehicle_manager", **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.namespace = namespace
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                metric = f"{self.namespace}_{name}"
+                lines.append(f"# TYPE {metric} counter")
+                lines.extend(
+                    f"{metric}{_format(labels)} {_number(value)}"
+                    for labels, value in series.items()
+                )
+            for name, histograms in sorted(self.histograms.items()):
+                metric = f"{self.namespace}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for labels, histogram in histograms.items():
+                    lines.extend(_render_histogram(metric, labels, histogram))
+        return "\n".join(lines) + "\n"
+
+
+class MetricsCallback(Protocol):
+    def __call__(self, kind: str, name: str, value: float, labels: dict[str, str]) -> None: ...
+
+
+class CallbackMetrics(MetricsSink):
+    """Forwards every sample to ``callback(kind, name, value, labels)``.
+
+    ``kind`` is ``"counter"`` or ``"histogram"``; use it to bridge to StatsD, OpenTelemetry
+    and the like.
+    """
+
+    enabled = True
+
+    def __init__(self, callback: MetricsCallback) -> None:
+        self.callback = callback
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        self.callback("counter", name, value, labels)
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        self.callback("histogram", name, value, labels)
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def timed(operation: str) -> Callable[[F], F]:
+    """Mark a method to be timed into the ``operation_seconds`` histogram by ``instrument``."""
+
+    def decorator(method: F) -> F:
+        method.__timed_operation__ = operation  # type: ignore[attr-defined]
+        return method
+
+    return decorator
+
+
+def instrument(obj: object, metrics: MetricsSink) -> None:
+    """Wrap the ``timed`` methods of ``obj`` with timers.
+
+    Nothing is wrapped for a disabled sink, so uninstrumented calls cost nothing extra.
+    """
+    if not metrics.enabled:
+        return
+    for name in dir(type(obj)):
+        operation = getattr(getattr(type(obj), name), "__timed_operation__", None)
+        if operation is not None:
+            setattr(obj, name, _timed_method(getattr(obj, name), metrics, operation))
+
+
+def _timed_method(
+    method: Callable[..., Any], metrics: MetricsSink, operation: str
+) -> Callable[..., Any]:
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with metrics.timer("operation_seconds", operation=operation):
+            return method(*args, **kwargs)
+
+    return wrapper
+
+
+def _format(labels: Labels, **extra: str) -> str:
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    """Exact sample value: ``:g`` would round byte counters to 6 significant digits."""
+    if isinstance(value, int) or (value.is_integer() and abs(value) < 2**53):
+        return str(int(value))
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _render_histogram(metric: str, labels: Labels, histogram: Histogram) -> Iterator[str]:
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts, strict=True):
+        cumulative += count
+        yield f"{metric}_bucket{_format(labels, le=f'{bound:g}')} {cumulative}"
+    yield f"{metric}_bucket{_format(labels, le='+Inf')} {histogram.count}"
+    yield f"{metric}_sum{_format(labels)} {_number(histogram.sum)}"
+    yield f"{metric}_count{_format(labels)} {histogram.count}"
@@ -0,0 +1,191 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any, NamedTuple, overload
+
+from src.models import Vehicle, VehicleTable
+
+MAGIC = b"VMSNAP01"
+_HEADER_SIZE = struct.Struct("<I")
+_ALIGNMENT = 8
+
+# Column name, array typecode. Numeric columns come first, then string table indexes.
+_NUMERIC_COLUMNS = (
+    ("ids", "q"),
+    ("years", "q"),
+    ("prices", "q"),
+    ("latitudes", "d"),
+    ("longitudes", "d"),
+)
+_STRING_COLUMNS = ("names", "models", "colors")
+_HEADER_FIELDS: dict[str, type | tuple[type, ...]] = {
+    "count": int,
+    "strings": int,
+    "byteorder": str,
+    "etag": (str, type(None)),
+    "last_modified": (str, type(None)),
+    "saved_at": (int, float),
+}
+
+
+class SnapshotFile(NamedTuple):
+    table: VehicleTable
+    etag: str | None
+    last_modified: str | None
+    saved_at: float
+
+
+class _StringColumn(Sequence[str]):
+    """Strings of a column looked up lazily through its string table indexes."""
+
+    __slots__ = ("_indexes", "_strings")
+
+    def __init__(self, indexes: memoryview, strings: list[str]) -> None:
+        self._indexes = indexes
+        self._strings = strings
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self._strings[i] for i in self._indexes[index]]
+        return self._strings[self._indexes[index]]
+
+
+def save_snapshot(
+    path: str | os.PathLike[str],
+    vehicles: Iterable[Vehicle],
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> None:
+    """Write the fleet as fixed-width columns plus a string table.
+
+    The file is replaced atomically, so a reader never sees a partly written snapshot.
+    """
+    table = vehicles if isinstance(vehicles, VehicleTable) else VehicleTable.from_vehicles(vehicles)
+    strings: dict[str, int] = {}
+    columns = [array(typecode, getattr(table, name)) for name, typecode in _NUMERIC_COLUMNS]
+    for name in _STRING_COLUMNS:
+        columns.append(
+            array("I", (strings.setdefault(value, len(strings)) for value in getattr(table, name)))
+        )
+    encoded = [value.encode() for value in strings]
+    offsets = array("I", [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    columns.append(offsets)
+
+    header = json.dumps(
+        {
+            "count": len(table),
+            "strings": len(strings),
+            "byteorder": sys.byteorder,
+            "etag": etag,
+            "last_modified": last_modified,
+            "saved_at": time.time(),
+        }
+    ).encode()
+
+    path = Path(path)
+    # A unique temporary file: processes sharing ``path`` must not write into each other's.
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(MAGIC + _HEADER_SIZE.pack(len(header)) + header)
+            for column in columns:
+                _pad(file)
+                column.tofile(file)
+            file.write(b"".join(encoded))
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def load_snapshot(path: str | os.PathLike[str]) -> SnapshotFile:
+    """Open a snapshot via ``mmap``; numeric columns are zero-copy views of the file.
+
+    Raises ``ValueError`` for a file that is not a valid snapshot or was written on a
+    platform with another byte order.
+    """
+    with open(path, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(buffer)
+    position = len(MAGIC) + _HEADER_SIZE.size
+    if len(view) < position or view[: len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a vehicles snapshot")
+    (header_size,) = _HEADER_SIZE.unpack_from(view, len(MAGIC))
+    header = _parse_header(bytes(view[position : position + header_size]), path)
+    position += header_size
+
+    count = header["count"]
+    numeric = {}
+    for name, typecode in _NUMERIC_COLUMNS:
+        numeric[name], position = _column(view, position, typecode, count)
+    indexes = {}
+    for name in _STRING_COLUMNS:
+        indexes[name], position = _column(view, position, "I", count)
+    offsets, position = _column(view, position, "I", header["strings"] + 1)
+    if position + offsets[-1] > len(view):
+        raise ValueError("Snapshot file is truncated")
+    strings = [
+        sys.intern(str(view[position + start : position + end], "utf-8"))
+        for start, end in zip(offsets, offsets[1:], strict=False)
+    ]
+    if any(count and max(column) >= len(strings) for column in indexes.values()):
+        raise ValueError(f"{path} refers to strings missing from its string table")
+
+    table = VehicleTable.from_columns(
+        ids=numeric["ids"],
+        names=_StringColumn(indexes["names"], strings),
+        models=_StringColumn(indexes["models"], strings),
+        years=numeric["years"],
+        colors=_StringColumn(indexes["colors"], strings),
+        prices=numeric["prices"],
+        latitudes=numeric["latitudes"],
+        longitudes=numeric["longitudes"],
+    )
+    return SnapshotFile(table, header["etag"], header["last_modified"], header["saved_at"])
+
+
+def _parse_header(data: bytes, path: str | os.PathLike[str]) -> dict[str, Any]:
+    try:
+        header = json.loads(data)
+    except ValueError as err:
+        raise ValueError(f"{path} has an invalid snapshot header") from err
+    if not isinstance(header, dict) or any(
+        not isinstance(header.get(key), types) for key, types in _HEADER_FIELDS.items()
+    ):
+        raise ValueError(f"{path} has an invalid snapshot header")
+    if header["count"] < 0 or header["strings"] < 0:
+        raise ValueError(f"{path} has an invalid snapshot header")
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError(f"{path} was written with {header['byteorder']}-endian byte order")
+    return header
+
+
+def _column(view: memoryview, position: int, typecode: str, count: int) -> tuple[memoryview, int]:
+    position += -position % _ALIGNMENT
+    end = position + count * array(typecode).itemsize
+    if end > len(view):
+        raise ValueError("Snapshot file is truncated")
+    return view[position:end].cast(typecode), end  # type: ignore[call-overload]
+
+
+def _pad(file: Any) -> None:
+    file.write(b"\0" * (-file.tell() % _ALIGNMENT))
@@ -0,0 +1,198 @@
+import operator
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any, get_type_hints
+
+from src.models import Vehicle
+
+VEHICLE_FIELDS: dict[str, Any] = get_type_hints(Vehicle)
+
+OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "in": lambda value, options: value in options,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge,
+}
+
+# Fields the backend may filter on with ``GET /vehicles?field=value`` and a value for each
+# that can never match, used to detect whether the backend honours the parameter.
+PUSHDOWN_PROBES: dict[str, Any] = {
+    "id": -1,
+    "name": "\x00probe",
+    "model": "\x00probe",
+    "year": -1,
+    "color": "\x00probe",
+    "price": -1,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Predicate:
+    field: str
+    op: str
+    value: Any
+
+    def matches(self, vehicle: Vehicle) -> bool:
+        return OPERATORS[self.op](getattr(vehicle, self.field), self.value)
+
+
+def parse_params(params: dict[str, Any]) -> list[Predicate]:
+    """Turn ``{"name": "Toyota", "price__lt": 30000, "year__in": [2020, 2021]}`` into predicates."""
+    keys = {key: _split_key(key) for key in params}
+    if error_attrs := {key for key, (name, op) in keys.items() if name not in VEHICLE_FIELDS}:
+        raise AttributeError(f"'Vehicle' object has no attributes: {error_attrs}")
+
+    predicates = []
+    for key, value in params.items():
+        name, op = keys[key]
+        field_type = VEHICLE_FIELDS[name]
+        if op == "in":
+            if not isinstance(value, list | tuple | set | frozenset):
+                raise TypeError(
+                    f"'Vehicle.{name}' expects a collection for 'in' received {type(value)}"
+                )
+            wrong = [item for item in value if not isinstance(item, field_type)]
+            if wrong:
+                raise TypeError(f"'Vehicle.{name}' has type {field_type} received {type(wrong[0])}")
+            value = frozenset(value)
+        elif not isinstance(value, field_type):
+            raise TypeError(f"'Vehicle.{name}' has type {field_type} received {type(value)}")
+        predicates.append(Predicate(field=name, op=op, value=value))
+    return predicates
+
+
+def pushdown_params(predicates: list[Predicate], supported: frozenset[str]) -> dict[str, Any]:
+    """Query parameters for the equality predicates the backend handles.
+
+    They only narrow the response: the backend may match more loosely (case, type coercion),
+    so the caller still checks every predicate on the rows it receives.
+    """
+    params: dict[str, Any] = {}
+    for predicate in predicates:
+        if predicate.op == "eq" and predicate.field in supported and predicate.field not in params:
+            params[predicate.field] = predicate.value
+    return params
+
+
+def _split_key(key: str) -> tuple[str, str]:
+    name, sep, op = key.rpartition("__")
+    if sep and op in OPERATORS:
+        return name, op
+    return key, "eq"
+
+
+class FilterIndex:
+    """Rows with lazily built per-field hash (``eq``, ``in``) and sorted (ranges) indexes.
+
+    A query starts from the most selective indexed predicate and checks the remaining
+    predicates only on its candidates. Rows are keyed by insertion order so they can be
+    added and removed without rebuilding the indexes. A batch larger than ``rebuild_ratio``
+    of the rows drops the indexes instead, they are rebuilt by the next query.
+    """
+
+    def __init__(
+        self, vehicles: Iterable[Vehicle] = (), rebuild_ratio: float = 0.1, min_rebuild: int = 64
+    ) -> None:
+        self.rebuild_ratio = rebuild_ratio
+        self.min_rebuild = min_rebuild
+        self._rows: dict[int, Vehicle] = {}
+        self._next_key = 0
+        self._hash: dict[str, dict[Any, set[int]]] = {}
+        self._sorted: dict[str, list[tuple[Any, int]]] = {}
+        for vehicle in vehicles:
+            self.add(vehicle)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, vehicle: Vehicle) -> int:
+        key = self._next_key
+        self._next_key += 1
+        self._rows[key] = vehicle
+        self._index(key, vehicle)
+        return key
+
+    def replace(self, key: int, vehicle: Vehicle) -> None:
+        self._unindex(key, self._rows[key])
+        self._rows[key] = vehicle
+        self._index(key, vehicle)
+
+    def remove(self, key: int) -> None:
+        self._unindex(key, self._rows.pop(key))
+
+    def expect_changes(self, count: int) -> None:
+        """Called before a batch of ``count`` changes; each one costs O(n) in a sorted index."""
+        if count > max(self.min_rebuild, self.rebuild_ratio * len(self._rows)):
+            self._hash.clear()
+            self._sorted.clear()
+
+    def _index(self, key: int, vehicle: Vehicle) -> None:
+        for name, buckets in self._hash.items():
+            buckets.setdefault(getattr(vehicle, name), set()).add(key)
+        for name, entries in self._sorted.items():
+            insort(entries, (getattr(vehicle, name), key))
+
+    def _unindex(self, key: int, vehicle: Vehicle) -> None:
+        for name, buckets in self._hash.items():
+            bucket = buckets[getattr(vehicle, name)]
+            bucket.discard(key)
+            if not bucket:
+                del buckets[getattr(vehicle, name)]
+        for name, entries in self._sorted.items():
+            entry = (getattr(vehicle, name), key)
+            del entries[bisect_left(entries, entry)]
+
+    def select(self, predicates: list[Predicate]) -> list[Vehicle]:
+        if not predicates:
+            return list(self._rows.values())
+
+        plans = [(self._plan(predicate), predicate) for predicate in predicates]
+        (_, candidates), chosen = min(plans, key=lambda item: item[0][0])
+        rest = [predicate for predicate in predicates if predicate is not chosen]
+        return [
+            vehicle
+            for vehicle in (self._rows[key] for key in sorted(candidates()))
+            if all(predicate.matches(vehicle) for predicate in rest)
+        ]
+
+    def _plan(self, predicate: Predicate) -> tuple[int, Callable[[], Iterable[int]]]:
+        """Estimated number of candidates and a way to list them without touching the rows."""
+        if predicate.op == "eq":
+            bucket = self._hash_index(predicate.field).get(predicate.value, set())
+            return len(bucket), lambda: bucket
+        if predicate.op == "in":
+            buckets = self._hash_index(predicate.field)
+            matched = [buckets[value] for value in predicate.value if value in buckets]
+            return sum(map(len, matched)), lambda: set().union(*matched)
+
+        entries = self._sorted_index(predicate.field)
+        first = operator.itemgetter(0)
+        lo, hi = 0, len(entries)
+        match predicate.op:
+            case "lt":
+                hi = bisect_left(entries, predicate.value, key=first)
+            case "lte":
+                hi = bisect_right(entries, predicate.value, key=first)
+            case "gt":
+                lo = bisect_right(entries, predicate.value, key=first)
+            case "gte":
+                lo = bisect_left(entries, predicate.value, key=first)
+        return max(hi - lo, 0), lambda: (key for _, key in entries[lo:hi])
+
+    def _hash_index(self, name: str) -> dict[Any, set[int]]:
+        if name not in self._hash:
+            buckets: dict[Any, set[int]] = {}
+            for key, vehicle in self._rows.items():
+                buckets.setdefault(getattr(vehicle, name), set()).add(key)
+            self._hash[name] = buckets
+        return self._hash[name]
+
+    def _sorted_index(self, name: str) -> list[tuple[Any, int]]:
+        if name not in self._sorted:
+            self._sorted[name] = sorted(
+                (getattr(vehicle, name), key) for key, vehicle in self._rows.items()
+            )
+        return self._sorted[name]
@@ -0,0 +1,82 @@
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+
+from src import exeptions as e
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retries with full-jitter exponential backoff.
+
+    Only idempotent methods are retried, so a ``POST`` is never sent twice.
+    """
+
+    total: int = 3
+    backoff_factor: float = 0.1
+    max_backoff: float = 10.0
+    status_forcelist: frozenset[int] = frozenset((429, 502, 503, 504))
+    allowed_methods: frozenset[str] = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+    respect_retry_after: bool = True
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        return attempt < self.total and method.upper() in self.allowed_methods
+
+    def backoff(self, attempt: int, retry_after: str | None = None) -> float:
+        if self.respect_retry_after and (delay := _parse_retry_after(retry_after)) is not None:
+            return min(delay, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2**attempt))  # noqa: S311
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class CircuitBreaker:
+    """Fails fast after ``failure_threshold`` consecutive failures.
+
+    After ``reset_timeout`` seconds a single trial call is let through: success closes the
+    circuit, failure opens it again.
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    clock: Callable[[], float] = time.monotonic
+    failures: int = field(default=0, init=False)
+    opened_at: float | None = field(default=None, init=False)
+    _trial_in_flight: bool = field(default=False, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if self.clock() - self.opened_at < self.reset_timeout or self._trial_in_flight:
+                raise e.VehicleManagerUnavailableError("Circuit breaker is open")
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+            self._trial_in_flight = False
@@ -0,0 +1,63 @@
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one execution.
+
+    The first caller runs the function; callers arriving while it is in flight wait and
+    receive the same result or exception.
+    """
+
+    def __init__(self) -> None:
+        self.coalesced = 0
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[no-any-return]
+
+        try:
+            call.result = func()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                # ``forget`` may already have made room for a newer call under this key.
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+        return call.result  # type: ignore[no-any-return]
+
+    def forget(self, key: Hashable) -> None:
+        """Let the next caller of ``key`` start a new call instead of joining the current one.
+
+        Used after a write so that later readers do not get a result fetched before it.
+        """
+        with self._lock:
+            self._calls.pop(key, None)
@@ -0,0 +1,156 @@
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+from src.models import Vehicle
+from src.vehicle_manager.query import FilterIndex, Predicate
+from src.vehicle_manager.spatial import IncrementalSpatialIndex
+
+
+@dataclass(frozen=True)
+class FleetDiff:
+    added: list[Vehicle] = field(default_factory=list)
+    changed: list[Vehicle] = field(default_factory=list)
+    removed: list[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+class FleetSnapshot:
+    """Latest known state of the fleet keyed by vehicle id.
+
+    New fleet lists are applied as diffs against the previous state, so the filter and
+    spatial indexes are updated incrementally, and every non-empty diff is published to
+    the subscribers.
+
+    Changes and index queries hold ``lock``: the indexes are built and rebuilt lazily on
+    query, so even reads mutate them. Subscribers run under the lock and may query.
+
+    The snapshot keeps its own copies of the vehicles and returns copies, so callers editing
+    a vehicle they got can't change index keys underneath the indexes.
+    """
+
+    def __init__(self) -> None:
+        self._vehicles: dict[int, Vehicle] = {}
+        self._keys: dict[int, int] = {}
+        self._subscribers: list[Callable[[FleetDiff], None]] = []
+        self.filter_index = FilterIndex()
+        self.spatial_index = IncrementalSpatialIndex(self._vehicles)
+        self.version = 0
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._vehicles)
+
+    @property
+    def vehicles(self) -> list[Vehicle]:
+        with self.lock:
+            return [vehicle.copy() for vehicle in self._vehicles.values()]
+
+    def get(self, vehicle_id: int) -> Vehicle | None:
+        vehicle = self._vehicles.get(vehicle_id)
+        return None if vehicle is None else vehicle.copy()
+
+    @property
+    def subscribed(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, callback: Callable[[FleetDiff], None]) -> Callable[[], None]:
+        """Register ``callback`` for every change, returns a function that unsubscribes it."""
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def select(self, predicates: list[Predicate]) -> list[Vehicle]:
+        with self.lock:
+            return [vehicle.copy() for vehicle in self.filter_index.select(predicates)]
+
+    def k_nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int,
+        exclude: Callable[[Vehicle], bool] | None = None,
+    ) -> list[tuple[Vehicle, float]]:
+        with self.lock:
+            found = self.spatial_index.k_nearest(
+                latitude=latitude, longitude=longitude, k=k, exclude=exclude
+            )
+        return [(vehicle.copy(), distance) for vehicle, distance in found]
+
+    def within_radius(
+        self, latitude: float, longitude: float, meters: float
+    ) -> list[tuple[Vehicle, float]]:
+        with self.lock:
+            found = self.spatial_index.within_radius(
+                latitude=latitude, longitude=longitude, meters=meters
+            )
+        return [(vehicle.copy(), distance) for vehicle, distance in found]
+
+    def apply(self, vehicles: Iterable[Vehicle]) -> FleetDiff:
+        incoming = {vehicle.id: vehicle for vehicle in vehicles if vehicle.id is not None}
+        with self.lock:
+            return self._apply_incoming(incoming)
+
+    def _apply_incoming(self, incoming: dict[int, Vehicle]) -> FleetDiff:
+        current = self._vehicles
+        diff = FleetDiff(
+            added=[v for vehicle_id, v in incoming.items() if vehicle_id not in current],
+            changed=[
+                v
+                for vehicle_id, v in incoming.items()
+                if vehicle_id in current and current[vehicle_id] != v
+            ],
+            removed=[vehicle_id for vehicle_id in current if vehicle_id not in incoming],
+        )
+        self._apply_diff(diff)
+        return diff
+
+    def upsert(self, vehicle: Vehicle) -> FleetDiff:
+        with self.lock:
+            if vehicle.id is None or self._vehicles.get(vehicle.id) == vehicle:
+                return FleetDiff()
+            if vehicle.id in self._vehicles:
+                diff = FleetDiff(changed=[vehicle])
+            else:
+                diff = FleetDiff(added=[vehicle])
+            self._apply_diff(diff)
+            return diff
+
+    def discard(self, vehicle_id: int) -> FleetDiff:
+        with self.lock:
+            diff = FleetDiff(removed=[vehicle_id] if vehicle_id in self._vehicles else [])
+            self._apply_diff(diff)
+            return diff
+
+    def clear(self) -> None:
+        """Drop every vehicle and index without publishing a diff, e.g. when nobody reads them."""
+        with self.lock:
+            self._vehicles = {}
+            self._keys = {}
+            self.filter_index = FilterIndex()
+            self.spatial_index = IncrementalSpatialIndex(self._vehicles)
+            self.version += 1
+
+    def _apply_diff(self, diff: FleetDiff) -> None:
+        if not diff:
+            return
+        self.filter_index.expect_changes(len(diff.removed) + len(diff.changed) + len(diff.added))
+        for vehicle_id in diff.removed:
+            del self._vehicles[vehicle_id]
+            self.filter_index.remove(self._keys.pop(vehicle_id))
+            self.spatial_index.remove(vehicle_id)
+        for vehicle in diff.changed:
+            vehicle = vehicle.copy()
+            self._vehicles[vehicle.id] = vehicle  # type: ignore[index]
+            self.filter_index.replace(self._keys[vehicle.id], vehicle)  # type: ignore[index]
+            self.spatial_index.upsert(vehicle)
+        for vehicle in diff.added:
+            vehicle = vehicle.copy()
+            self._vehicles[vehicle.id] = vehicle  # type: ignore[index]
+            self._keys[vehicle.id] = self.filter_index.add(vehicle)  # type: ignore[index]
+            self.spatial_index.upsert(vehicle)
+        self.version += 1
+
+        for callback in list(self._subscribers):
+            callback(diff)
@@ -0,0 +1,273 @@
+import heapq
+import math
+from collections.abc import Callable, Iterable, Mapping, Sequence
+
+from src.models import Vehicle
+from src.vehicle_manager.distance import EARTH_RADIUS
+
+Point = tuple[float, float, float]
+
+
+def to_unit_vector(latitude: float, longitude: float) -> Point:
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    cos_lat = math.cos(lat)
+    return cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat)
+
+
+def chord_to_meters(chord: float) -> float:
+    return 2 * EARTH_RADIUS * math.asin(min(chord / 2, 1.0))
+
+
+def meters_to_chord(meters: float) -> float:
+    return 2 * math.sin(min(meters / (2 * EARTH_RADIUS), math.pi / 2))
+
+
+def scan_k_nearest(
+    vehicles: Iterable[Vehicle],
+    latitude: float,
+    longitude: float,
+    k: int,
+    exclude: Callable[[Vehicle], bool] | None = None,
+) -> list[tuple[Vehicle, float]]:
+    """Single pass k-nearest over a stream of vehicles keeping only ``k`` of them in memory."""
+    target = to_unit_vector(latitude, longitude)
+    candidates = (
+        (_squared_distance(to_unit_vector(v.latitude, v.longitude), target), v)
+        for v in vehicles
+        if exclude is None or not exclude(v)
+    )
+    return [
+        (vehicle, chord_to_meters(math.sqrt(dist)))
+        for dist, vehicle in heapq.nsmallest(k, candidates, key=lambda item: item[0])
+    ]
+
+
+def scan_within_radius(
+    vehicles: Iterable[Vehicle],
+    latitude: float,
+    longitude: float,
+    meters: float,
+    exclude: Callable[[Vehicle], bool] | None = None,
+) -> list[tuple[Vehicle, float]]:
+    target = to_unit_vector(latitude, longitude)
+    limit = meters_to_chord(meters) ** 2 if meters >= 0 else -1.0
+    found = []
+    for vehicle in vehicles:
+        if exclude is not None and exclude(vehicle):
+            continue
+        dist = _squared_distance(to_unit_vector(vehicle.latitude, vehicle.longitude), target)
+        if dist <= limit:
+            found.append((dist, vehicle))
+    found.sort(key=lambda item: item[0])
+    return [(vehicle, chord_to_meters(math.sqrt(dist))) for dist, vehicle in found]
+
+
+class SpatialIndex:
+    """Implicit k-d tree over vehicle positions projected onto the unit sphere.
+
+    Chord length between unit vectors grows monotonically with the great-circle
+    distance, so the nearest vehicle in 3D space is also the nearest on the globe.
+    """
+
+    def __init__(self, vehicles: Sequence[Vehicle]) -> None:
+        self.vehicles = vehicles
+        self._points = [to_unit_vector(v.latitude, v.longitude) for v in self.vehicles]
+        self._order = list(range(len(self.vehicles)))
+        self._build(0, len(self._order), 0)
+
+    def __len__(self) -> int:
+        return len(self.vehicles)
+
+    def _build(self, lo: int, hi: int, axis: int) -> None:
+        if hi - lo <= 1:
+            return
+        points = self._points
+        self._order[lo:hi] = sorted(self._order[lo:hi], key=lambda i: points[i][axis])
+        mid = (lo + hi) // 2
+        self._build(lo, mid, (axis + 1) % 3)
+        self._build(mid + 1, hi, (axis + 1) % 3)
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        exclude: Callable[[Vehicle], bool] | None = None,
+    ) -> tuple[Vehicle, float] | None:
+        result = self.k_nearest(latitude, longitude, k=1, exclude=exclude)
+        return result[0] if result else None
+
+    def k_nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int,
+        exclude: Callable[[Vehicle], bool] | None = None,
+    ) -> list[tuple[Vehicle, float]]:
+        if k <= 0:
+            return []
+        target = to_unit_vector(latitude, longitude)
+        # Max-heap of the best k candidates as (-distance, -index) pairs.
+        heap: list[tuple[float, int]] = []
+        self._search_k_nearest(target, 0, len(self._order), 0, k, exclude, heap)
+        return [
+            (self.vehicles[index], chord_to_meters(math.sqrt(dist)))
+            for dist, index in sorted((-dist, -index) for dist, index in heap)
+        ]
+
+    def within_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        meters: float,
+        exclude: Callable[[Vehicle], bool] | None = None,
+    ) -> list[tuple[Vehicle, float]]:
+        if meters < 0:
+            return []
+        target = to_unit_vector(latitude, longitude)
+        chord = meters_to_chord(meters)
+        found: list[tuple[float, int]] = []
+        self._search_radius(target, 0, len(self._order), 0, chord * chord, exclude, found)
+        return [
+            (self.vehicles[index], chord_to_meters(math.sqrt(dist)))
+            for dist, index in sorted(found)
+        ]
+
+    def _search_k_nearest(
+        self,
+        target: Point,
+        lo: int,
+        hi: int,
+        axis: int,
+        k: int,
+        exclude: Callable[[Vehicle], bool] | None,
+        heap: list[tuple[float, int]],
+    ) -> None:
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        index = self._order[mid]
+        point = self._points[index]
+        if exclude is None or not exclude(self.vehicles[index]):
+            dist = _squared_distance(point, target)
+            if len(heap) < k:
+                heapq.heappush(heap, (-dist, -index))
+            elif (dist, index) < (-heap[0][0], -heap[0][1]):
+                heapq.heapreplace(heap, (-dist, -index))
+
+        diff = target[axis] - point[axis]
+        near, far = ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+        next_axis = (axis + 1) % 3
+        self._search_k_nearest(target, *near, next_axis, k, exclude, heap)
+        if len(heap) < k or diff * diff <= -heap[0][0]:
+            self._search_k_nearest(target, *far, next_axis, k, exclude, heap)
+
+    def _search_radius(
+        self,
+        target: Point,
+        lo: int,
+        hi: int,
+        axis: int,
+        limit: float,
+        exclude: Callable[[Vehicle], bool] | None,
+        found: list[tuple[float, int]],
+    ) -> None:
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        index = self._order[mid]
+        point = self._points[index]
+        if exclude is None or not exclude(self.vehicles[index]):
+            dist = _squared_distance(point, target)
+            if dist <= limit:
+                found.append((dist, index))
+
+        diff = target[axis] - point[axis]
+        next_axis = (axis + 1) % 3
+        if diff * diff <= limit or diff < 0:
+            self._search_radius(target, lo, mid, next_axis, limit, exclude, found)
+        if diff * diff <= limit or diff >= 0:
+            self._search_radius(target, mid + 1, hi, next_axis, limit, exclude, found)
+
+
+def _squared_distance(a: Point, b: Point) -> float:
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+
+
+class IncrementalSpatialIndex:
+    """``SpatialIndex`` over a live ``{id: Vehicle}`` mapping that tolerates updates.
+
+    Changes since the last build are kept aside: the stale tree entries are skipped and the
+    fresh vehicles are scanned linearly. The tree is rebuilt on the next query once the
+    pending changes exceed ``rebuild_ratio`` of the fleet.
+    """
+
+    def __init__(
+        self, vehicles: Mapping[int, Vehicle], rebuild_ratio: float = 0.1, min_rebuild: int = 64
+    ) -> None:
+        self._vehicles = vehicles
+        self.rebuild_ratio = rebuild_ratio
+        self.min_rebuild = min_rebuild
+        self._tree: SpatialIndex | None = None
+        self._stale: set[int] = set()
+        self._fresh: dict[int, Vehicle] = {}
+
+    def upsert(self, vehicle: Vehicle) -> None:
+        if self._tree is None or vehicle.id is None:
+            return
+        self._stale.add(vehicle.id)
+        self._fresh[vehicle.id] = vehicle
+
+    def remove(self, vehicle_id: int) -> None:
+        if self._tree is None:
+            return
+        self._stale.add(vehicle_id)
+        self._fresh.pop(vehicle_id, None)
+
+    def k_nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int,
+        exclude: Callable[[Vehicle], bool] | None = None,
+    ) -> list[tuple[Vehicle, float]]:
+        tree = self._get_tree()
+        found = tree.k_nearest(latitude, longitude, k=k, exclude=self._tree_exclude(exclude))
+        if self._fresh:
+            found += scan_k_nearest(self._fresh.values(), latitude, longitude, k, exclude)
+            found = sorted(found, key=lambda item: item[1])[:k]
+        return found
+
+    def within_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        meters: float,
+        exclude: Callable[[Vehicle], bool] | None = None,
+    ) -> list[tuple[Vehicle, float]]:
+        tree = self._get_tree()
+        found = tree.within_radius(latitude, longitude, meters, self._tree_exclude(exclude))
+        if self._fresh:
+            found += scan_within_radius(self._fresh.values(), latitude, longitude, meters, exclude)
+            found.sort(key=lambda item: item[1])
+        return found
+
+    def _tree_exclude(
+        self, exclude: Callable[[Vehicle], bool] | None
+    ) -> Callable[[Vehicle], bool] | None:
+        if not self._stale:
+            return exclude
+        stale = self._stale
+        if exclude is None:
+            return lambda v: v.id in stale
+        return lambda v: v.id in stale or exclude(v)
+
+    def _get_tree(self) -> SpatialIndex:
+        pending = len(self._stale) + len(self._fresh)
+        if self._tree is None or pending > max(
+            self.min_rebuild, self.rebuild_ratio * len(self._vehicles)
+        ):
+            self._tree = SpatialIndex(list(self._vehicles.values()))
+            self._stale.clear()
+            self._fresh.clear()
+        return self._tree
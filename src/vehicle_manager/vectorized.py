@@ -0,0 +1,72 @@
+from collections.abc import Iterable
+from typing import Any
+
+from src.models import Vehicle, VehicleTable
+from src.vehicle_manager.distance import EARTH_RADIUS
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("Vectorized distances require numpy: pip install numpy")
+
+
+def coordinates(vehicles: Iterable[Vehicle]) -> Any:
+    _require_numpy()
+    if isinstance(vehicles, VehicleTable):
+        return np.column_stack(
+            (
+                np.frombuffer(vehicles.latitudes, dtype=np.float64),
+                np.frombuffer(vehicles.longitudes, dtype=np.float64),
+            )
+        )
+    return np.array([(v.latitude, v.longitude) for v in vehicles], dtype=np.float64).reshape(-1, 2)
+
+
+def _prepare(points: Any) -> tuple[Any, Any, Any]:
+    radians = np.radians(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+    return np.sin(radians[:, 0]), np.cos(radians[:, 0]), radians[:, 1]
+
+
+def distance_matrix(origins: Any, targets: Any) -> Any:
+    """Distances in meters between every origin (rows) and target (columns).
+
+    Both arguments are array-likes of ``(latitude, longitude)`` pairs in degrees.
+    Uses the same spherical law of cosines as ``VehicleManager._calculate_distance``.
+    """
+    _require_numpy()
+    sin_a, cos_a, lon_a = _prepare(origins)
+    sin_b, cos_b, lon_b = _prepare(targets)
+    return _distances(sin_a, cos_a, lon_a, sin_b, cos_b, lon_b)
+
+
+def nearest(origins: Any, targets: Any, chunk_size: int = 1024) -> tuple[Any, Any]:
+    """Index of the closest target and its distance in meters for every origin.
+
+    Rows are processed in chunks so memory stays bounded by ``chunk_size * len(targets)``.
+    """
+    _require_numpy()
+    sin_a, cos_a, lon_a = _prepare(origins)
+    sin_b, cos_b, lon_b = _prepare(targets)
+    if not len(lon_b):
+        raise ValueError("'targets' must contain at least one point")
+
+    indices = np.empty(len(lon_a), dtype=np.intp)
+    distances = np.empty(len(lon_a), dtype=np.float64)
+    for start in range(0, len(lon_a), chunk_size):
+        rows = slice(start, start + chunk_size)
+        matrix = _distances(sin_a[rows], cos_a[rows], lon_a[rows], sin_b, cos_b, lon_b)
+        indices[rows] = matrix.argmin(axis=1)
+        distances[rows] = matrix[np.arange(len(matrix)), indices[rows]]
+    return indices, distances
+
+
+def _distances(sin_a: Any, cos_a: Any, lon_a: Any, sin_b: Any, cos_b: Any, lon_b: Any) -> Any:
+    cosine = np.outer(sin_a, sin_b) + np.outer(cos_a, cos_b) * np.cos(
+        lon_b[np.newaxis, :] - lon_a[:, np.newaxis]
+    )
+    return np.arccos(np.clip(cosine, -1.0, 1.0)) * EARTH_RADIUS
@@ -0,0 +1,41 @@
+import random
+import time
+from collections.abc import Callable
+
+from src.models import Vehicle
+
+NAMES = ["Toyota", "BMW", "Mercedes", "Lada"]
+COLORS = ["red", "black", "white"]
+
+
+def make_fleet(size: int, seed: int = 0) -> list[Vehicle]:
+    """Random fleet with ids ``1..size``, reproducible for the same ``seed``."""
+    rnd = random.Random(seed)
+    return [
+        Vehicle(
+            id=i,
+            name=rnd.choice(NAMES),
+            model="Model",
+            year=rnd.randint(2000, 2024),
+            color=rnd.choice(COLORS),
+            price=rnd.randrange(5000, 100000, 500),
+            latitude=rnd.uniform(-90, 90),
+            longitude=rnd.uniform(-180, 180),
+        )
+        for i in range(1, size + 1)
+    ]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.001)
@@ -0,0 +1,289 @@
+import gzip
+import json
+import time
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from requests_mock import Mocker as RequestsMocker
+
+from src.exeptions import (
+    VehicleManagerAPIError,
+    VehicleManagerUnavailableError,
+    VehiclesInavlidResponseError,
+)
+from src.vehicle_manager.api import API, Transfer, _JSONArrayReader, create_session
+from src.vehicle_manager.retry import CircuitBreaker, RetryPolicy
+
+VEHICLES = [
+    {
+        "id": i,
+        "name": "Лада",
+        "model": "Веста]",
+        "year": 2021,
+        "color": "red",
+        "price": 21000,
+        "latitude": 55.753332,
+        "longitude": 37.621676,
+    }
+    for i in range(20)
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 20])
+def test_json_array_reader__chunk_boundaries(chunk_size: int) -> None:
+    raw = json.dumps(VEHICLES, ensure_ascii=False, indent=2).encode()
+    chunks = [raw[i : i + chunk_size] for i in range(0, len(raw), chunk_size)]
+
+    assert list(_JSONArrayReader(chunks)) == VEHICLES
+
+
+def test_json_array_reader__empty_list() -> None:
+    assert list(_JSONArrayReader([b" [ ", b"] "])) == []
+
+
+@pytest.mark.parametrize(
+    ("body", "message"),
+    [
+        (b"", "Unexpected end of the vehicles list"),
+        (b'[{"id": 1}', "Unexpected end of the vehicles list"),
+        (b'{"id": 1}', "Expected '\\[' but got '{'"),
+        (b'[{"id": }]', "Expecting value"),
+        (b"[{} {}]", "Expected ',' or '\\]' but got '{'"),
+        (b"[{},]", "Expecting value"),
+        (b"[,{}]", "Expecting value"),
+        (b"[{}]garbage", "Unexpected 'g' after the vehicles list"),
+        (b"[1, 2]", "Expected a vehicle object but got int"),
+    ],
+)
+def test_json_array_reader__invalid(body: bytes, message: str) -> None:
+    with pytest.raises(VehiclesInavlidResponseError, match=message):
+        list(_JSONArrayReader([body]))
+
+
+@pytest.fixture()
+def api(environ: dict[str, str]) -> API:
+    return API(url=environ["VEHICELS_API_URL"], timeout=5)
+
+
+def test_get_list__conditional_request(api: API, requests_mock: RequestsMocker) -> None:
+    list_mock = requests_mock.get(
+        url=f"{api.url}/vehicles",
+        response_list=[
+            {
+                "json": VEHICLES,
+                "headers": {"ETag": '"v1"', "Last-Modified": "Wed, 21 Oct 2026 07:28:00 GMT"},
+            },
+            {"status_code": 304},
+        ],
+    )
+
+    first = api.get_list()
+    second = api.get_list()
+
+    assert second is first
+    assert list_mock.request_history[0].headers.get("If-None-Match") is None
+    assert list_mock.request_history[1].headers["If-None-Match"] == '"v1"'
+    assert (
+        list_mock.request_history[1].headers["If-Modified-Since"] == "Wed, 21 Oct 2026 07:28:00 GMT"
+    )
+
+
+def test_get_list__changed_after_revalidation(api: API, requests_mock: RequestsMocker) -> None:
+    requests_mock.get(
+        url=f"{api.url}/vehicles",
+        response_list=[
+            {"json": VEHICLES, "headers": {"ETag": '"v1"'}},
+            {"json": VEHICLES[:1], "headers": {"ETag": '"v2"'}},
+        ],
+    )
+
+    api.get_list()
+
+    assert api.get_list() == VEHICLES[:1]
+
+
+def test_get_list__without_validators(api: API, requests_mock: RequestsMocker) -> None:
+    list_mock = requests_mock.get(url=f"{api.url}/vehicles", json=VEHICLES)
+
+    api.get_list()
+    api.get_list()
+
+    assert list_mock.request_history[1].headers.get("If-None-Match") is None
+
+
+@pytest.fixture()
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    calls: list[float] = []
+    monkeypatch.setattr(time, "sleep", calls.append)
+    return calls
+
+
+def test_send__retries_retryable_status(
+    api: API, requests_mock: RequestsMocker, sleeps: list[float]
+) -> None:
+    list_mock = requests_mock.get(
+        url=f"{api.url}/vehicles",
+        response_list=[
+            {"status_code": 503},
+            {"status_code": 429, "headers": {"Retry-After": "2"}},
+            {"json": VEHICLES},
+        ],
+    )
+
+    assert api.get_list() == VEHICLES
+    assert list_mock.call_count == 3
+    assert sleeps[1] == 2
+
+
+def test_send__gives_up_after_total(
+    api: API, requests_mock: RequestsMocker, sleeps: list[float]
+) -> None:
+    list_mock = requests_mock.get(url=f"{api.url}/vehicles", status_code=503)
+
+    with pytest.raises(VehicleManagerAPIError, match="503"):
+        api.get_list()
+    assert list_mock.call_count == api.retry.total + 1
+
+
+def test_send__post_is_not_retried(
+    api: API, requests_mock: RequestsMocker, sleeps: list[float]
+) -> None:
+    create_mock = requests_mock.post(url=f"{api.url}/vehicles", status_code=503)
+
+    with pytest.raises(VehicleManagerAPIError):
+        api.create(vehicle=VEHICLES[0])
+    assert create_mock.call_count == 1
+    assert sleeps == []
+
+
+def test_send__connection_error(
+    api: API, requests_mock: RequestsMocker, sleeps: list[float]
+) -> None:
+    vehicle_mock = requests_mock.get(
+        url=f"{api.url}/vehicles/1", exc=requests.exceptions.ConnectTimeout
+    )
+
+    with pytest.raises(VehicleManagerAPIError):
+        api.get(vehicle_id=1)
+    assert vehicle_mock.call_count == api.retry.total + 1
+
+
+def test_send__circuit_breaker_fails_fast(
+    environ: dict[str, str], requests_mock: RequestsMocker, sleeps: list[float]
+) -> None:
+    api = API(
+        url=environ["VEHICELS_API_URL"],
+        timeout=5,
+        retry=RetryPolicy(total=0),
+        circuit_breaker=CircuitBreaker(failure_threshold=2),
+    )
+    vehicle_mock = requests_mock.get(url=f"{api.url}/vehicles/1", status_code=500)
+
+    for _ in range(2):
+        with pytest.raises(VehicleManagerAPIError):
+            api.get(vehicle_id=1)
+    with pytest.raises(VehicleManagerUnavailableError):
+        api.get(vehicle_id=1)
+    assert vehicle_mock.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        requests.exceptions.ChunkedEncodingError,
+        requests.TooManyRedirects,
+        requests.RequestException,
+    ],
+)
+def test_send__other_request_errors_end_half_open_trial(
+    environ: dict[str, str], requests_mock: RequestsMocker, error: type[Exception]
+) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    api = API(url=environ["VEHICELS_API_URL"], timeout=5, circuit_breaker=breaker)
+    requests_mock.get(
+        url=f"{api.url}/vehicles/1",
+        response_list=[{"status_code": 500}, {"exc": error}, {"exc": error}, {"json": VEHICLES[1]}],
+    )
+
+    with pytest.raises(VehicleManagerAPIError):
+        api.get(vehicle_id=1)
+    for _ in range(2):
+        with pytest.raises(VehicleManagerAPIError) as exc_info:
+            api.get(vehicle_id=1)
+        assert not isinstance(exc_info.value, VehicleManagerUnavailableError)
+        assert isinstance(exc_info.value.__cause__, error)
+
+    assert api.get(vehicle_id=1) == VEHICLES[1]
+    assert breaker.opened_at is None
+
+
+def test_create_session__pool_settings() -> None:
+    session = create_session(pool_connections=2, pool_maxsize=32, pool_block=True)
+
+    adapter = session.get_adapter("https://example.com")
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 32
+    assert adapter.poolmanager.connection_pool_kw["block"] is True
+    assert session.headers.get("Connection") != "close"
+
+
+def test_api__keep_alive_disabled(environ: dict[str, str], requests_mock: RequestsMocker) -> None:
+    api = API(url=environ["VEHICELS_API_URL"], timeout=(1, 5), keep_alive=False)
+    requests_mock.get(url=f"{api.url}/vehicles", json=[])
+
+    api.get_list()
+
+    assert requests_mock.last_request is not None
+    assert requests_mock.last_request.headers["Connection"] == "close"
+    assert requests_mock.last_request.timeout == (1, 5)
+
+
+def test_api__shared_session_stays_open(
+    environ: dict[str, str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    session = create_session()
+    closed = []
+    monkeypatch.setattr(session, "close", lambda: closed.append(session))
+    first = API(url=environ["VEHICELS_API_URL"], timeout=5, session=session)
+    second = API(url=environ["VEHICELS_API_URL"], timeout=5, session=session)
+
+    first.close()
+    second.close()
+
+    assert second.session is session
+    assert not closed
+
+
+def test_compression__counts_wire_and_decoded_bytes(
+    api: API, requests_mock: RequestsMocker
+) -> None:
+    body = json.dumps(VEHICLES).encode()
+    requests_mock.get(
+        url=f"{api.url}/vehicles",
+        content=gzip.compress(body),
+        headers={"Content-Encoding": "gzip"},
+    )
+
+    assert api.get_list() == VEHICLES
+    assert requests_mock.last_request is not None
+    assert "gzip" in requests_mock.last_request.headers["Accept-Encoding"]
+    assert api.last_transfer == Transfer("gzip", len(gzip.compress(body)), len(body))
+
+    assert list(api.iter_list(chunk_size=16)) == VEHICLES
+    assert api.transfer_stats.requests == 2
+    assert api.transfer_stats.decoded_bytes == 2 * len(body)
+    assert api.transfer_stats.compression_ratio > 1
+
+
+def test_compression__disabled(environ: dict[str, str], requests_mock: RequestsMocker) -> None:
+    api = API(url=environ["VEHICELS_API_URL"], timeout=5, compression=False)
+    requests_mock.get(url=f"{api.url}/vehicles", json=VEHICLES)
+
+    api.get_list()
+
+    assert requests_mock.last_request is not None
+    assert requests_mock.last_request.headers["Accept-Encoding"] == "identity"
+    assert api.last_transfer is not None
+    assert api.last_transfer.wire_bytes == api.last_transfer.decoded_bytes
+    assert api.transfer_stats.compression_ratio == 1
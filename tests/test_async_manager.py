@@ -0,0 +1,154 @@
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from src.exeptions import VehicleManagerAPIError, VehicleNotFoundError
+from src.models import Vehicle
+
+httpx = pytest.importorskip("httpx")
+async_manager = pytest.importorskip("src.vehicle_manager.async_manager")
+
+BASE_URL = "https://test.tspb.su/test-task"
+
+FLEET = {
+    1: {
+        "id": 1,
+        "name": "Toyota",
+        "model": "Camry",
+        "year": 2021,
+        "color": "red",
+        "price": 21000,
+        "latitude": 55.753332,
+        "longitude": 37.621676,
+    },
+    2: {
+        "id": 2,
+        "name": "BMW",
+        "model": "X5",
+        "year": 2015,
+        "color": "black",
+        "price": 20000,
+        "latitude": 59.986607,
+        "longitude": 30.321435,
+    },
+    3: {
+        "id": 3,
+        "name": "Mercedes",
+        "model": "S500",
+        "year": 2009,
+        "color": "white",
+        "price": 40000,
+        "latitude": 59.950317,
+        "longitude": 30.31799,
+    },
+}
+
+
+def handler(request: Any) -> Any:
+    path = request.url.path.removeprefix("/test-task")
+    if path == "/vehicles" and request.method == "GET":
+        return httpx.Response(200, json=list(FLEET.values()))
+    if path == "/vehicles" and request.method == "POST":
+        return httpx.Response(200, json={**json.loads(request.content), "id": 4})
+    if path == "/vehicles/500":
+        return httpx.Response(500, json={"error": "Internal error"})
+
+    vehicle_id = int(path.rsplit("/", 1)[1])
+    if vehicle_id not in FLEET:
+        return httpx.Response(404, json={"error": "Vehicle not found"})
+    if request.method == "PUT":
+        return httpx.Response(200, json=json.loads(request.content))
+    return httpx.Response(200, json=FLEET[vehicle_id])
+
+
+def run(coro: Any, transport_handler: Any = handler) -> Any:
+    async def wrapper() -> Any:
+        async with async_manager.AsyncVehicleManager(
+            url=BASE_URL, transport=httpx.MockTransport(transport_handler), max_concurrency=2
+        ) as manager:
+            return await coro(manager)
+
+    return asyncio.run(wrapper())
+
+
+def test_get_vehicles() -> None:
+    result = run(lambda manager: manager.get_vehicles())
+
+    assert result == [Vehicle.parse(data) for data in FLEET.values()]
+
+
+def test_get_vehicle() -> None:
+    assert run(lambda manager: manager.get_vehicle(vehicle_id=2)) == Vehicle.parse(FLEET[2])
+
+
+def test_get_vehicle__not_found() -> None:
+    with pytest.raises(VehicleNotFoundError, match="'Vehicle' object not found with id=9"):
+        run(lambda manager: manager.get_vehicle(vehicle_id=9))
+
+
+def test_get_vehicle__server_error() -> None:
+    with pytest.raises(VehicleManagerAPIError):
+        run(lambda manager: manager.get_vehicle(vehicle_id=500))
+
+
+def refuse_connection(request: Any) -> Any:
+    raise httpx.ConnectError("Connection refused", request=request)
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda manager: manager.get_vehicles(),
+        lambda manager: manager.get_vehicle(vehicle_id=1),
+        lambda manager: manager.add_vehicle(vehicle=Vehicle.parse(FLEET[1])),
+        lambda manager: manager.update_vehicle(vehicle=Vehicle.parse(FLEET[1])),
+        lambda manager: manager.delete_vehicle(vehicle_id=1),
+    ],
+)
+def test_connection_error(call: Any) -> None:
+    with pytest.raises(VehicleManagerAPIError, match="Connection refused"):
+        run(call, transport_handler=refuse_connection)
+
+
+def test_add_vehicle() -> None:
+    data = {**FLEET[1], "id": None}
+
+    result = run(lambda manager: manager.add_vehicle(vehicle=Vehicle.parse(data)))
+
+    assert result == Vehicle.parse({**FLEET[1], "id": 4})
+
+
+def test_update_vehicle() -> None:
+    result = run(lambda manager: manager.update_vehicle(vehicle=Vehicle.parse(FLEET[1])))
+
+    assert result == Vehicle.parse(FLEET[1])
+
+
+def test_delete_vehicle__not_found() -> None:
+    with pytest.raises(VehicleNotFoundError):
+        run(lambda manager: manager.delete_vehicle(vehicle_id=9))
+
+
+def test_get_distance() -> None:
+    assert run(lambda manager: manager.get_distance(id1=1, id2=2)) == 638005.0864183326
+
+
+def test_get_nearest_vehicle() -> None:
+    result = run(lambda manager: manager.get_nearest_vehicle(vehicle_id=1))
+
+    assert result == Vehicle.parse(FLEET[3])
+
+
+def test_many_lookups_in_flight() -> None:
+    async def lookups(manager: Any) -> Any:
+        return await asyncio.gather(*(manager.get_vehicle(vehicle_id=i % 3 + 1) for i in range(50)))
+
+    assert len(run(lookups)) == 50
+
+
+def test_get_vehicles_by_ids() -> None:
+    result = run(lambda manager: manager.get_vehicles_by_ids([3, 1, 3]))
+
+    assert result == [Vehicle.parse(FLEET[3]), Vehicle.parse(FLEET[1])]
@@ -0,0 +1,91 @@
+from src.models import Vehicle
+from src.vehicle_manager.cache import CacheInfo, FleetCache, VehicleCache
+from tests.helpers import FakeClock
+
+VEHICLE = Vehicle(
+    id=1,
+    name="Toyota",
+    model="Camry",
+    year=2021,
+    color="red",
+    price=21000,
+    latitude=55.753332,
+    longitude=37.621676,
+)
+
+
+def test_fleet_cache__expires_after_ttl() -> None:
+    clock = FakeClock()
+    cache = FleetCache(ttl=10, clock=clock)
+    cache.set([VEHICLE])
+
+    clock.now = 9.9
+    assert cache.get() == [VEHICLE]
+    clock.now = 10
+    assert cache.get() is None
+
+
+def test_fleet_cache__disabled() -> None:
+    cache = FleetCache(ttl=0)
+    cache.set([VEHICLE])
+
+    assert cache.get() is None
+
+
+def test_fleet_cache__max_size() -> None:
+    cache = FleetCache(ttl=10, max_size=1)
+    cache.set([VEHICLE])
+    cache.set([VEHICLE, VEHICLE])
+
+    assert cache.get() is None
+
+
+def test_fleet_cache__invalidate() -> None:
+    cache = FleetCache(ttl=10)
+    cache.set([VEHICLE])
+    cache.invalidate()
+
+    assert cache.get() is None
+
+
+def test_vehicle_cache__evicts_least_recently_used() -> None:
+    cache = VehicleCache(maxsize=2)
+    first, second, third = (
+        Vehicle("Toyota", "Camry", 2021, "red", 21000, 0.0, 0.0, id=i) for i in (1, 2, 3)
+    )
+    cache.put_many([first, second])
+    cache.get(1)
+    cache.put(third)
+
+    assert cache.get(1) == first
+    assert cache.get(2) is None
+    assert cache.get(3) == third
+    assert cache.info() == CacheInfo(hits=3, misses=1, maxsize=2, currsize=2)
+
+
+def test_vehicle_cache__copies_in_and_out() -> None:
+    cache = VehicleCache(maxsize=2)
+    vehicle = VEHICLE.copy()
+    cache.put(vehicle)
+    vehicle.price = 1
+    cached = cache.get(1)
+    assert cached is not None
+    cached.price = 2
+
+    assert cache.get(1) == VEHICLE
+
+
+def test_vehicle_cache__disabled() -> None:
+    cache = VehicleCache(maxsize=0)
+    cache.put(VEHICLE)
+
+    assert cache.get(1) is None
+    assert cache.info().currsize == 0
+
+
+def test_vehicle_cache__pop() -> None:
+    cache = VehicleCache(maxsize=2)
+    cache.put(VEHICLE)
+    cache.pop(1)
+
+    assert cache.get(1) is None
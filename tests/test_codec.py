@@ -0,0 +1,72 @@
+import json
+from dataclasses import asdict
+
+import pytest
+from requests_mock import Mocker as RequestsMocker
+
+from src.exeptions import VehiclesInavlidResponseError
+from src.vehicle_manager.api import API
+from src.vehicle_manager.codec import CODECS, JSONCodec, get_codec
+from tests.helpers import make_fleet
+
+
+@pytest.fixture(params=sorted(CODECS))
+def codec(request: pytest.FixtureRequest) -> JSONCodec:
+    return get_codec(request.param)
+
+
+def test_loads_vehicles(codec: JSONCodec) -> None:
+    fleet = make_fleet(20)
+    payload = json.dumps([asdict(vehicle) for vehicle in fleet]).encode()
+
+    assert codec.loads_vehicles(payload) == fleet
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [b"[{", b'{"id": 1}', b'[{"id": 1, "wheels": 4}]'],
+)
+def test_loads_vehicles__invalid(codec: JSONCodec, payload: bytes) -> None:
+    with pytest.raises(ValueError):  # noqa: PT011
+        codec.loads_vehicles(payload)
+
+
+def test_dumps__round_trip(codec: JSONCodec) -> None:
+    value = {"name": "Лада", "price": 21000, "latitude": 55.753332, "id": None}
+
+    assert json.loads(codec.dumps(value)) == value
+    assert codec.loads(codec.dumps(value)) == value
+
+
+def test_get_codec__fastest_available() -> None:
+    assert get_codec().name == next(
+        name for name in ("msgspec", "orjson", "json") if name in CODECS
+    )
+
+
+def test_get_codec__unknown() -> None:
+    with pytest.raises(ValueError, match="JSON codec 'yaml' is not available"):
+        get_codec("yaml")
+
+
+def test_api__uses_codec(
+    environ: dict[str, str], requests_mock: RequestsMocker, codec: JSONCodec
+) -> None:
+    api = API(url=environ["VEHICELS_API_URL"], timeout=5, codec=codec)
+    fleet = make_fleet(3)
+    requests_mock.get(url=f"{api.url}/vehicles", json=[asdict(vehicle) for vehicle in fleet])
+    create_mock = requests_mock.post(url=f"{api.url}/vehicles", json=asdict(fleet[0]))
+
+    assert api.get_vehicles() == fleet
+    assert api.create(vehicle=asdict(fleet[0])) == asdict(fleet[0])
+    assert create_mock.last_request is not None
+    assert create_mock.last_request.json() == asdict(fleet[0])
+    assert create_mock.last_request.headers["Content-Type"] == "application/json"
+
+
+def test_api__invalid_vehicles(environ: dict[str, str], requests_mock: RequestsMocker) -> None:
+    api = API(url=environ["VEHICELS_API_URL"], timeout=5)
+    requests_mock.get(url=f"{api.url}/vehicles", json=[{"id": 1}])
+
+    with pytest.raises(VehiclesInavlidResponseError):
+        api.get_vehicles()
@@ -0,0 +1,55 @@
+import pytest
+
+from src.vehicle_manager.distance import (
+    DISTANCE_FUNCTIONS,
+    DistanceMode,
+    equirectangular,
+    haversine,
+    spherical_cosine,
+    vincenty,
+)
+
+MOSCOW = (55.753332, 37.621676)
+SAINT_PETERSBURG = (59.986607, 30.321435)
+
+
+@pytest.mark.parametrize("mode", list(DistanceMode))
+def test_identical_points(mode: DistanceMode) -> None:
+    assert DISTANCE_FUNCTIONS[mode](*MOSCOW, *MOSCOW) == pytest.approx(0, abs=1e-3)
+
+
+def test_spherical_cosine__rounding_outside_domain() -> None:
+    assert spherical_cosine(55.839102, 144.779742, 55.839102, 144.779742) == 0
+
+
+def test_haversine__matches_spherical_cosine() -> None:
+    assert haversine(*MOSCOW, *SAINT_PETERSBURG) == pytest.approx(
+        spherical_cosine(*MOSCOW, *SAINT_PETERSBURG), rel=1e-9
+    )
+
+
+def test_haversine__stable_for_nearby_points() -> None:
+    assert haversine(55.0, 37.0, 55.0, 37.0000001) == pytest.approx(0.00638, rel=1e-2)
+
+
+def test_equirectangular__close_for_short_distances() -> None:
+    start, end = (59.986607, 30.321435), (59.950317, 30.31799)
+
+    assert equirectangular(*start, *end) == pytest.approx(haversine(*start, *end), rel=1e-4)
+
+
+def test_equirectangular__wraps_antimeridian() -> None:
+    assert equirectangular(0, 179.9, 0, -179.9) == pytest.approx(
+        haversine(0, 179.9, 0, -179.9), rel=1e-6
+    )
+
+
+def test_vincenty__reference_value() -> None:
+    # Flinders Peak -> Buninyong, the classic example from Vincenty's paper.
+    distance = vincenty(-37.95103342, 144.42486789, -37.65282114, 143.92649554)
+
+    assert distance == pytest.approx(54972.271, abs=1e-3)
+
+
+def test_vincenty__antipodal_fallback() -> None:
+    assert vincenty(0, 0, 0.5, 179.7) == pytest.approx(haversine(0, 0, 0.5, 179.7), rel=1e-2)
@@ -0,0 +1,117 @@
+from collections.abc import Iterator
+from dataclasses import replace
+
+import pytest
+import requests
+
+from src.exeptions import VehicleManagerAPIError, VehicleNotFoundError
+from src.fake_server import FakeVehiclesServer, generate_fleet
+from src.models import Vehicle
+from src.vehicle_manager import RetryPolicy, VehicleManager
+
+
+@pytest.fixture()
+def server() -> Iterator[FakeVehiclesServer]:
+    with FakeVehiclesServer(generate_fleet(50)) as server:
+        yield server
+
+
+def test_generate_fleet__deterministic() -> None:
+    assert generate_fleet(10, seed=1) == generate_fleet(10, seed=1)
+    assert [vehicle.id for vehicle in generate_fleet(3)] == [1, 2, 3]
+
+
+def test_manager__reads(server: FakeVehiclesServer) -> None:
+    fleet = generate_fleet(50)
+
+    with VehicleManager(url=server.url) as manager:
+        assert manager.get_vehicles() == fleet
+        assert list(manager.iter_vehicles()) == fleet
+        assert manager.get_vehicle(vehicle_id=7) == fleet[6]
+        assert manager.filter_vehicles({"color": "red"}) == [
+            vehicle for vehicle in fleet if vehicle.color == "red"
+        ]
+        with pytest.raises(VehicleNotFoundError):
+            manager.get_vehicle(vehicle_id=1000)
+
+
+def test_manager__crud(server: FakeVehiclesServer) -> None:
+    vehicle = Vehicle("Toyota", "Camry", 2021, "red", 21000, latitude=55.75, longitude=37.62)
+
+    with VehicleManager(url=server.url) as manager:
+        created = manager.add_vehicle(vehicle)
+        assert created == replace(vehicle, id=51)
+
+        updated = manager.update_vehicle(replace(created, price=19000))
+        assert manager.get_vehicle(vehicle_id=51) == updated
+
+        manager.delete_vehicle(vehicle_id=51)
+        with pytest.raises(VehicleNotFoundError):
+            manager.delete_vehicle(vehicle_id=51)
+        assert len(manager.get_vehicles()) == 50
+
+
+def test_server_filters_pushdown(server: FakeVehiclesServer) -> None:
+    with VehicleManager(url=server.url, server_filters=True) as manager:
+        assert manager.probe_server_filters() == {"id", "name", "model", "year", "color", "price"}
+        assert [vehicle.id for vehicle in manager.filter_vehicles({"id": 3})] == [3]
+
+
+def test_list_revalidation(server: FakeVehiclesServer) -> None:
+    first = requests.get(f"{server.url}/vehicles", timeout=5)
+    second = requests.get(
+        f"{server.url}/vehicles", headers={"If-None-Match": first.headers["ETag"]}, timeout=5
+    )
+
+    assert second.status_code == 304
+
+    with VehicleManager(url=server.url) as manager:
+        assert manager.get_vehicles() is not manager.get_vehicles()
+        assert manager.api.is_revalidated(manager.api.get_vehicles())
+
+
+def test_bad_requests(server: FakeVehiclesServer) -> None:
+    assert requests.get(f"{server.url}/trucks", timeout=5).status_code == 404
+    assert requests.patch(f"{server.url}/vehicles/1", timeout=5).status_code == 405
+    assert requests.post(f"{server.url}/vehicles", data=b"{", timeout=5).status_code == 400
+    assert requests.put(f"{server.url}/vehicles/1", json={"a": 1}, timeout=5).status_code == 400
+
+
+def test_error_rate(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+
+    with (
+        FakeVehiclesServer(generate_fleet(5), error_rate=1.0, seed=0) as server,
+        VehicleManager(url=server.url, retry=RetryPolicy(total=2)) as manager,
+        pytest.raises(VehicleManagerAPIError),
+    ):
+        manager.get_vehicle(vehicle_id=1)
+
+    assert server.requests == 3
+
+
+def test_latency() -> None:
+    with FakeVehiclesServer(generate_fleet(1), latency=0.05) as server:
+        response = requests.get(f"{server.url}/vehicles/1", timeout=5)
+
+    assert response.elapsed.total_seconds() >= 0.05
+
+
+def test_manager__update_of_edited_vehicle(server: FakeVehiclesServer) -> None:
+    with VehicleManager(url=server.url, cache_ttl=60) as manager:
+        vehicle = manager.filter_vehicles({"color": "red"})[0]
+        vehicle.color = "blue"
+        manager.update_vehicle(vehicle)
+
+        assert vehicle not in manager.filter_vehicles({"color": "red"})
+        assert vehicle in manager.filter_vehicles({"color": "blue"})
+        manager.delete_vehicle(vehicle.id or 0)
+        assert vehicle not in manager.filter_vehicles({"color": "blue"})
+
+
+def test_start__busy_port_raises(server: FakeVehiclesServer) -> None:
+    with (
+        pytest.raises(OSError, match="(?i)address already in use"),
+        FakeVehiclesServer(port=server.port),
+    ):
+        pass
@@ -0,0 +1,134 @@
+from dataclasses import asdict
+
+import pytest
+from requests_mock import Mocker as RequestsMocker
+
+from src.exeptions import VehicleManagerAPIError
+from src.vehicle_manager import (
+    CallbackMetrics,
+    InMemoryMetrics,
+    MetricsSink,
+    PrometheusMetrics,
+    VehicleManager,
+)
+from src.vehicle_manager.metrics import NULL_METRICS, Histogram
+from tests.helpers import make_fleet
+
+
+def test_null_metrics__shared_noop_timer() -> None:
+    assert NULL_METRICS.timer("a") is NULL_METRICS.timer("b", label="x")
+
+
+def test_in_memory_metrics() -> None:
+    metrics = InMemoryMetrics(buckets=(0.1, 1.0))
+
+    metrics.increment("requests_total", status="200")
+    metrics.increment("requests_total", 2, status="200")
+    metrics.observe("latency_seconds", 0.05, endpoint="/vehicles")
+    metrics.observe("latency_seconds", 0.5, endpoint="/vehicles")
+    metrics.observe("latency_seconds", 5, endpoint="/vehicles")
+
+    assert metrics.counter("requests_total", status="200") == 3
+    assert metrics.counter("requests_total", status="500") == 0
+    histogram = metrics.histogram("latency_seconds", endpoint="/vehicles")
+    assert histogram is not None
+    assert histogram.counts == [1, 1]
+    assert histogram.count == 3
+    assert histogram.sum == pytest.approx(5.55)
+
+
+def test_histogram__quantile() -> None:
+    histogram = Histogram(buckets=(1.0, 2.0, 3.0))
+    for value in (0.5, 0.5, 1.5, 2.5):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == 1.0
+    assert histogram.quantile(0.99) == 3.0
+    histogram.observe(10)
+    assert histogram.quantile(1.0) == float("inf")
+
+
+def test_prometheus_metrics__render() -> None:
+    metrics = PrometheusMetrics(namespace="fleet", buckets=(0.1, 1.0))
+    metrics.increment("requests_total", method="GET", status="200")
+    metrics.observe("latency_seconds", 0.5, label='a"b')
+
+    assert metrics.render() == (
+        "# TYPE fleet_requests_total counter\n"
+        'fleet_requests_total{method="GET",status="200"} 1\n'
+        "# TYPE fleet_latency_seconds histogram\n"
+        'fleet_latency_seconds_bucket{label="a\\"b",le="0.1"} 0\n'
+        'fleet_latency_seconds_bucket{label="a\\"b",le="1"} 1\n'
+        'fleet_latency_seconds_bucket{label="a\\"b",le="+Inf"} 1\n'
+        'fleet_latency_seconds_sum{label="a\\"b"} 0.5\n'
+        'fleet_latency_seconds_count{label="a\\"b"} 1\n'
+    )
+
+
+def test_callback_metrics() -> None:
+    samples = []
+    metrics = CallbackMetrics(lambda *sample: samples.append(sample))
+
+    metrics.increment("requests_total", status="200")
+    with metrics.timer("latency_seconds", endpoint="/vehicles"):
+        pass
+
+    assert samples[0] == ("counter", "requests_total", 1, {"status": "200"})
+    kind, name, value, labels = samples[1]
+    assert (kind, name, labels) == ("histogram", "latency_seconds", {"endpoint": "/vehicles"})
+    assert value >= 0
+
+
+@pytest.mark.parametrize("metrics", [NULL_METRICS, InMemoryMetrics()])
+def test_manager__instrumented(
+    environ: dict[str, str], requests_mock: RequestsMocker, metrics: MetricsSink
+) -> None:
+    base_url = environ["VEHICELS_API_URL"]
+    fleet = make_fleet(10)
+    requests_mock.get(url=f"{base_url}/vehicles", json=[asdict(vehicle) for vehicle in fleet])
+    requests_mock.get(url=f"{base_url}/vehicles/1", status_code=500)
+
+    with VehicleManager(url=base_url, cache_ttl=60, metrics=metrics) as manager:
+        manager.get_vehicles()
+        manager.get_k_nearest((0.0, 0.0), k=3)
+        with pytest.raises(VehicleManagerAPIError):
+            manager.get_vehicle(vehicle_id=1)
+
+    if not isinstance(metrics, InMemoryMetrics):
+        return
+    assert (
+        metrics.counter("http_requests_total", method="GET", endpoint="/vehicles", status="200")
+        == 1
+    )
+    assert (
+        metrics.counter(
+            "http_requests_total", method="GET", endpoint="/vehicles/{id}", status="500"
+        )
+        == 1
+    )
+    assert metrics.counter("cache_requests_total", cache="fleet", result="miss") == 1
+    assert metrics.counter("cache_requests_total", cache="fleet", result="hit") == 1
+    assert metrics.counter("http_decoded_bytes_total", encoding="identity") > 0
+    for name, labels in [
+        ("operation_seconds", {"operation": "get_vehicles"}),
+        ("operation_seconds", {"operation": "get_k_nearest"}),
+        ("operation_seconds", {"operation": "get_vehicle"}),
+        ("http_request_seconds", {"method": "GET", "endpoint": "/vehicles"}),
+        ("decode_seconds", {"codec": manager.api.codec.name, "target": "loads_vehicles"}),
+        ("snapshot_apply_seconds", {}),
+        ("spatial_query_seconds", {"query": "k_nearest"}),
+    ]:
+        assert metrics.histogram(name, **labels) is not None, name
+
+
+def test_prometheus_metrics__render_exact_values() -> None:
+    metrics = PrometheusMetrics(namespace="fleet", buckets=(1.0,))
+    metrics.increment("wire_bytes_total", 16_777_215)
+    metrics.increment("ratio_total", 0.1 + 0.2)
+    metrics.observe("size_bytes", 123_456_789)
+
+    rendered = metrics.render()
+
+    assert "fleet_wire_bytes_total 16777215\n" in rendered
+    assert "fleet_ratio_total 0.30000000000000004\n" in rendered
+    assert "fleet_size_bytes_sum 123456789\n" in rendered
@@ -0,0 +1,66 @@
+import pytest
+
+from src.models import Vehicle, VehicleTable
+
+VEHICLES = [
+    Vehicle(
+        id=1,
+        name="Toyota",
+        model="Camry",
+        year=2021,
+        color="red",
+        price=21000,
+        latitude=55.753332,
+        longitude=37.621676,
+    ),
+    Vehicle(
+        id=None,
+        name="BMW",
+        model="X5",
+        year=2015,
+        color="black",
+        price=20000,
+        latitude=59.986607,
+        longitude=30.321435,
+    ),
+]
+
+
+def test_vehicle__slots() -> None:
+    assert not hasattr(VEHICLES[0], "__dict__")
+
+
+def test_vehicle_table__rows() -> None:
+    table = VehicleTable.from_vehicles(VEHICLES)
+
+    assert len(table) == 2
+    assert table[0] == VEHICLES[0]
+    assert table[-1] == VEHICLES[1]
+    assert table[:] == VEHICLES
+    assert list(table) == VEHICLES
+
+
+def test_vehicle_table__from_records() -> None:
+    records = [
+        {
+            "id": i,
+            "name": "Toyota",
+            "model": "Camry",
+            "year": 2021,
+            "color": "red",
+            "price": 21000,
+            "latitude": 55.753332,
+            "longitude": 37.621676,
+        }
+        for i in range(3)
+    ]
+
+    table = VehicleTable.from_records(records)
+
+    assert list(table.ids) == [0, 1, 2]
+    assert table.names[0] is table.names[2]
+
+
+def test_vehicle_table__index_error() -> None:
+    with pytest.raises(IndexError):
+        VehicleTable()[0]
@@ -0,0 +1,230 @@
+import logging
+import re
+import struct
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+from requests_mock import Mocker as RequestsMocker
+
+from src.exeptions import VehicleManagerAPIError
+from src.fake_server import FakeVehiclesServer, generate_fleet
+from src.models import VehicleTable
+from src.vehicle_manager import VehicleManager
+from src.vehicle_manager.persistence import MAGIC, load_snapshot, save_snapshot
+
+
+@pytest.fixture()
+def path(tmp_path: Path) -> Path:
+    return tmp_path / "fleet.snapshot"
+
+
+@pytest.fixture()
+def base_url(environ: dict[str, str]) -> str:
+    return environ["VEHICELS_API_URL"]
+
+
+def test_save_load__round_trip(path: Path) -> None:
+    fleet = generate_fleet(100)
+    fleet[0].id = None
+
+    save_snapshot(path, fleet, etag='"v1"', last_modified="Wed, 21 Oct 2015 07:28:00 GMT")
+    saved = load_snapshot(path)
+
+    assert list(saved.table) == fleet
+    assert saved.table[5:8] == fleet[5:8]
+    assert saved.etag == '"v1"'
+    assert saved.last_modified == "Wed, 21 Oct 2015 07:28:00 GMT"
+
+
+def test_save_load__empty_fleet(path: Path) -> None:
+    save_snapshot(path, [])
+
+    saved = load_snapshot(path)
+
+    assert len(saved.table) == 0
+    assert saved.etag is None
+
+
+def test_load__numeric_columns_map_the_file(path: Path) -> None:
+    fleet = generate_fleet(10)
+    save_snapshot(path, VehicleTable.from_vehicles(fleet))
+
+    table = load_snapshot(path).table
+
+    assert isinstance(table.latitudes, memoryview)
+    assert table.latitudes.readonly
+    assert list(table.latitudes) == [vehicle.latitude for vehicle in fleet]
+    assert list(table.ids) == [vehicle.id for vehicle in fleet]
+
+
+def test_load__not_a_snapshot(path: Path) -> None:
+    path.write_bytes(b"[]")
+
+    with pytest.raises(ValueError, match="not a vehicles snapshot"):
+        load_snapshot(path)
+
+
+def test_load__truncated(path: Path) -> None:
+    save_snapshot(path, generate_fleet(10))
+    path.write_bytes(path.read_bytes()[:-100])
+
+    with pytest.raises(ValueError, match="truncated"):
+        load_snapshot(path)
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        b'{"count": 1}',
+        b"[1, 2]",
+        b'{"count": -1, "strings": 0, "byteorder": "little", '
+        b'"etag": null, "last_modified": null, "saved_at": 0}',
+        b"{",
+    ],
+)
+def test_load__invalid_header(path: Path, header: bytes) -> None:
+    path.write_bytes(MAGIC + struct.pack("<I", len(header)) + header + b"\0" * 64)
+
+    with pytest.raises(ValueError, match="invalid snapshot header"):
+        load_snapshot(path)
+
+
+def test_load__string_index_out_of_range(path: Path) -> None:
+    save_snapshot(path, generate_fleet(3))
+    data = path.read_bytes()
+    # Same header length, but a string table too short for the indexes.
+    path.write_bytes(re.sub(rb'"strings": \d', b'"strings": 1', data, count=1))
+
+    with pytest.raises(ValueError, match="missing from its string table"):
+        load_snapshot(path)
+
+
+def test_save__leaves_no_temporary_files(path: Path) -> None:
+    save_snapshot(path, generate_fleet(3))
+    save_snapshot(path, generate_fleet(5))
+
+    assert list(path.parent.iterdir()) == [path]
+
+
+def test_manager__saves_fetched_fleet(path: Path) -> None:
+    fleet = generate_fleet(20)
+
+    with (
+        FakeVehiclesServer(fleet) as server,
+        VehicleManager(url=server.url, cache_ttl=60, snapshot_path=path) as manager,
+    ):
+        manager.get_vehicles()
+
+    saved = load_snapshot(path)
+    assert list(saved.table) == fleet
+    assert saved.etag
+
+
+def test_manager__warm_start_revalidates(
+    path: Path, base_url: str, requests_mock: RequestsMocker
+) -> None:
+    fleet = generate_fleet(5)
+    save_snapshot(path, fleet, etag='"v1"')
+    requests_mock.get(url=f"{base_url}/vehicles", status_code=304, headers={"ETag": '"v1"'})
+
+    with VehicleManager(url=base_url, cache_ttl=60, snapshot_path=path) as manager:
+        assert manager.revalidation is not None
+        assert manager.revalidation.result() == fleet
+        assert manager.get_vehicles() == fleet
+        point = fleet[0].latitude, fleet[0].longitude
+        assert manager.get_k_nearest(point, k=1) == [fleet[0]]
+
+    assert requests_mock.call_count == 1
+    assert requests_mock.last_request is not None
+    assert requests_mock.last_request.headers["If-None-Match"] == '"v1"'
+
+
+def test_manager__warm_start_applies_changes(
+    path: Path, base_url: str, requests_mock: RequestsMocker
+) -> None:
+    fleet = generate_fleet(5)
+    save_snapshot(path, fleet, etag='"v1"')
+    changed = [*fleet[:4], generate_fleet(6)[5]]
+    requests_mock.get(
+        url=f"{base_url}/vehicles", json=[asdict(v) for v in changed], headers={"ETag": '"v2"'}
+    )
+
+    with VehicleManager(url=base_url, cache_ttl=60, snapshot_path=path) as manager:
+        assert manager.revalidation is not None
+        manager.revalidation.result()
+        assert manager.get_vehicles() == changed
+        assert manager.snapshot.vehicles == changed
+
+    saved = load_snapshot(path)
+    assert list(saved.table) == changed
+    assert saved.etag == '"v2"'
+
+
+def test_manager__warm_start_serves_while_server_fails(
+    path: Path, base_url: str, requests_mock: RequestsMocker
+) -> None:
+    fleet = generate_fleet(5)
+    save_snapshot(path, fleet, etag='"v1"')
+    requests_mock.get(url=f"{base_url}/vehicles", status_code=500)
+
+    with VehicleManager(url=base_url, cache_ttl=60, snapshot_path=path) as manager:
+        assert manager.revalidation is not None
+        with pytest.raises(VehicleManagerAPIError):
+            manager.revalidation.result()
+        assert manager.filter_vehicles({"id": 3}) == [fleet[2]]
+
+
+def test_manager__corrupt_snapshot_starts_cold(
+    path: Path, base_url: str, requests_mock: RequestsMocker
+) -> None:
+    fleet = generate_fleet(5)
+    path.write_bytes(b"garbage")
+    requests_mock.get(url=f"{base_url}/vehicles", json=[asdict(v) for v in fleet])
+
+    with VehicleManager(url=base_url, cache_ttl=60, snapshot_path=path) as manager:
+        assert manager.revalidation is None
+        assert manager.get_vehicles() == fleet
+
+
+def test_manager__corrupt_header_starts_cold(
+    path: Path, base_url: str, requests_mock: RequestsMocker
+) -> None:
+    header = b'{"count": 1}'
+    path.write_bytes(MAGIC + struct.pack("<I", len(header)) + header)
+    requests_mock.get(url=f"{base_url}/vehicles", json=[])
+
+    with VehicleManager(url=base_url, cache_ttl=60, snapshot_path=path) as manager:
+        assert manager.revalidation is None
+        assert manager.get_vehicles() == []
+
+
+def test_manager__failed_save_is_logged(
+    tmp_path: Path, base_url: str, requests_mock: RequestsMocker, caplog: pytest.LogCaptureFixture
+) -> None:
+    requests_mock.get(url=f"{base_url}/vehicles", json=[asdict(v) for v in generate_fleet(2)])
+    path = tmp_path / "missing" / "fleet.snapshot"
+
+    with (
+        caplog.at_level(logging.ERROR),
+        VehicleManager(url=base_url, cache_ttl=60, snapshot_path=path) as manager,
+    ):
+        manager.get_vehicles()
+
+    assert "Failed to save the fleet snapshot" in caplog.text
+
+
+def test_manager__unstorable_fleet_is_logged(
+    path: Path, base_url: str, requests_mock: RequestsMocker, caplog: pytest.LogCaptureFixture
+) -> None:
+    record = {**asdict(generate_fleet(1)[0]), "price": 21000.5}
+    requests_mock.get(url=f"{base_url}/vehicles", json=[record])
+
+    with (
+        caplog.at_level(logging.ERROR),
+        VehicleManager(url=base_url, cache_ttl=60, snapshot_path=path) as manager,
+    ):
+        manager.get_vehicles()
+
+    assert "Failed to save the fleet snapshot" in caplog.text
+    assert not path.exists()
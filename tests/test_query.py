@@ -0,0 +1,95 @@
+from dataclasses import replace
+
+import pytest
+
+from src.vehicle_manager.query import FilterIndex, Predicate, parse_params
+from tests.helpers import make_fleet
+
+
+def test_parse_params() -> None:
+    assert parse_params({"name": "Toyota", "price__lt": 30000, "year__in": [2020, 2021]}) == [
+        Predicate(field="name", op="eq", value="Toyota"),
+        Predicate(field="price", op="lt", value=30000),
+        Predicate(field="year", op="in", value=frozenset({2020, 2021})),
+    ]
+
+
+def test_parse_params__unknown_attribute() -> None:
+    with pytest.raises(AttributeError, match="'Vehicle' object has no attributes: {'type__lt'}"):
+        parse_params({"type__lt": 1})
+
+
+def test_parse_params__unknown_operator() -> None:
+    with pytest.raises(AttributeError, match="'Vehicle' object has no attributes: {'year__ne'}"):
+        parse_params({"year__ne": 2020})
+
+
+def test_parse_params__in_requires_collection() -> None:
+    with pytest.raises(TypeError, match="'Vehicle.year' expects a collection for 'in'"):
+        parse_params({"year__in": 2020})
+
+
+def test_parse_params__in_item_type() -> None:
+    with pytest.raises(
+        TypeError, match="'Vehicle.year' has type <class 'int'> received <class 'str'>"
+    ):
+        parse_params({"year__in": [2020, "2021"]})
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"name": "Toyota"},
+        {"name": "Tesla"},
+        {"name__in": ["BMW", "Lada"], "color": "red"},
+        {"price__lt": 20000},
+        {"price__lte": 20000, "price__gte": 10000},
+        {"year__gt": 2020, "name": "BMW"},
+        {"year__gte": 2030},
+        {"latitude__gt": 0.0, "longitude__lt": 0.0, "color__in": {"white"}},
+    ],
+)
+def test_filter_index__matches_scan(params: dict) -> None:
+    fleet = make_fleet(500)
+    predicates = parse_params(params)
+    expected = [v for v in fleet if all(p.matches(v) for p in predicates)]
+
+    assert FilterIndex(fleet).select(predicates) == expected
+
+
+def test_filter_index__add_and_remove() -> None:
+    fleet = make_fleet(100)
+    index = FilterIndex(fleet[:50])
+    predicates = parse_params({"name": "BMW", "price__lt": 50000})
+    index.select(predicates)
+
+    keys = [index.add(vehicle) for vehicle in fleet[50:]]
+    for key in keys[::2]:
+        index.remove(key)
+    remaining = fleet[:50] + fleet[50:][1::2]
+
+    assert len(index) == len(remaining)
+    assert index.select(predicates) == [
+        v for v in remaining if all(p.matches(v) for p in predicates)
+    ]
+
+
+def test_filter_index__large_batch_rebuilds() -> None:
+    fleet = make_fleet(1000)
+    index = FilterIndex(fleet)
+    predicates = parse_params({"name": "BMW", "price__lt": 50000})
+    index.select(predicates)
+
+    index.expect_changes(10)
+    assert index._hash
+    assert index._sorted
+    index.expect_changes(500)
+    assert not index._hash
+    assert not index._sorted
+
+    moved = [replace(vehicle, price=vehicle.price // 2) for vehicle in fleet[:500]]
+    for key, vehicle in enumerate(moved):
+        index.replace(key, vehicle)
+    current = moved + fleet[500:]
+    assert index.select(predicates) == [v for v in current if all(p.matches(v) for p in predicates)]
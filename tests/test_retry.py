@@ -0,0 +1,53 @@
+import pytest
+
+from src.exeptions import VehicleManagerUnavailableError
+from src.vehicle_manager.retry import CircuitBreaker, RetryPolicy
+from tests.helpers import FakeClock
+
+
+def test_retry_policy__backoff_is_bounded() -> None:
+    policy = RetryPolicy(backoff_factor=0.5, max_backoff=2)
+
+    assert all(0 <= policy.backoff(attempt) <= 0.5 * 2**attempt for attempt in range(2))
+    assert all(policy.backoff(attempt=10) <= 2 for _ in range(100))
+
+
+def test_retry_policy__retry_after() -> None:
+    policy = RetryPolicy(max_backoff=5)
+
+    assert policy.backoff(attempt=0, retry_after="3") == 3
+    assert policy.backoff(attempt=0, retry_after="120") == 5
+    assert policy.backoff(attempt=0, retry_after="Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert policy.backoff(attempt=0, retry_after="soon") <= policy.backoff_factor
+
+
+def test_retry_policy__idempotent_methods_only() -> None:
+    policy = RetryPolicy(total=2)
+
+    assert policy.can_retry("get", attempt=1)
+    assert not policy.can_retry("GET", attempt=2)
+    assert not policy.can_retry("POST", attempt=0)
+
+
+def test_circuit_breaker() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+
+    with pytest.raises(VehicleManagerUnavailableError):
+        breaker.before_call()
+
+    clock.now = 10
+    breaker.before_call()
+    with pytest.raises(VehicleManagerUnavailableError):
+        breaker.before_call()
+    breaker.record_failure()
+    with pytest.raises(VehicleManagerUnavailableError):
+        breaker.before_call()
+
+    clock.now = 20
+    breaker.before_call()
+    breaker.record_success()
+    breaker.before_call()
@@ -0,0 +1,75 @@
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+
+from src.vehicle_manager.singleflight import SingleFlight
+from tests.helpers import wait_for
+
+
+def run_concurrently(
+    flight: SingleFlight, threads: int, func: Callable[[], Any], release: threading.Event
+) -> list[Any]:
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [executor.submit(flight.do, "key", func) for _ in range(threads)]
+        wait_for(lambda: flight.coalesced == threads - 1)
+        release.set()
+        return [future.result() for future in futures]
+
+
+def test_do__coalesces_concurrent_calls() -> None:
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def func() -> object:
+        calls.append(1)
+        release.wait()
+        return object()
+
+    results = run_concurrently(flight, 8, func, release)
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_do__shares_exception() -> None:
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def func() -> None:
+        release.wait()
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        run_concurrently(flight, 4, func, release)
+    assert flight.coalesced == 3
+
+
+def test_do__sequential_calls_run_again() -> None:
+    flight = SingleFlight()
+
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    assert flight.coalesced == 0
+
+
+def test_forget() -> None:
+    flight = SingleFlight()
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow() -> str:
+        started.set()
+        release.wait()
+        return "stale"
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(flight.do, "key", slow)
+        started.wait()
+        flight.forget("key")
+        assert flight.do("key", lambda: "fresh") == "fresh"
+        release.set()
+        assert future.result() == "stale"
@@ -0,0 +1,108 @@
+import random
+from dataclasses import replace
+
+from src.models import Vehicle
+from src.vehicle_manager.query import parse_params
+from src.vehicle_manager.snapshot import FleetDiff, FleetSnapshot
+from src.vehicle_manager.spatial import SpatialIndex
+from tests.helpers import make_fleet
+
+
+def test_apply__diff() -> None:
+    fleet = make_fleet(5)
+    snapshot = FleetSnapshot()
+    snapshot.apply(fleet)
+    moved = replace(fleet[1], latitude=0.0)
+    added = replace(fleet[0], id=6)
+
+    diff = snapshot.apply([fleet[0], moved, fleet[3], fleet[4], added])
+
+    assert diff == FleetDiff(added=[added], changed=[moved], removed=[3])
+    assert snapshot.vehicles == [fleet[0], moved, fleet[3], fleet[4], added]
+
+
+def test_apply__no_changes() -> None:
+    fleet = make_fleet(5)
+    snapshot = FleetSnapshot()
+    snapshot.apply(fleet)
+    version = snapshot.version
+
+    assert not snapshot.apply(list(fleet))
+    assert snapshot.version == version
+
+
+def test_subscribe() -> None:
+    fleet = make_fleet(3)
+    snapshot = FleetSnapshot()
+    received: list[FleetDiff] = []
+    unsubscribe = snapshot.subscribe(received.append)
+
+    snapshot.apply(fleet)
+    snapshot.discard(vehicle_id=2)
+    snapshot.discard(vehicle_id=2)
+    unsubscribe()
+    snapshot.upsert(replace(fleet[0], price=1))
+
+    assert received == [FleetDiff(added=fleet), FleetDiff(removed=[2])]
+
+
+def test_indexes__updated_incrementally() -> None:
+    rnd = random.Random(5)
+    fleet = make_fleet(1000)
+    snapshot = FleetSnapshot()
+    snapshot.apply(fleet)
+    predicates = parse_params({"price__gte": 21000, "latitude__gt": 0.0})
+    snapshot.filter_index.select(predicates)
+    snapshot.spatial_index.k_nearest(latitude=0, longitude=0, k=1)
+
+    current = dict(enumerate(fleet, start=1))
+    for step in range(5):
+        for vehicle_id in rnd.sample(sorted(current), 20):
+            current[vehicle_id] = replace(
+                current[vehicle_id],
+                latitude=rnd.uniform(-90, 90),
+                longitude=rnd.uniform(-180, 180),
+                price=rnd.randint(20000, 22000),
+            )
+        for vehicle_id in rnd.sample(sorted(current), 5):
+            del current[vehicle_id]
+        current[2000 + step] = replace(fleet[0], id=2000 + step, latitude=1.0, longitude=1.0)
+        snapshot.apply(current.values())
+
+        vehicles = list(current.values())
+        assert snapshot.filter_index.select(predicates) == [
+            v for v in vehicles if all(p.matches(v) for p in predicates)
+        ]
+        assert snapshot.spatial_index.k_nearest(latitude=1, longitude=1, k=5) == SpatialIndex(
+            vehicles
+        ).k_nearest(latitude=1, longitude=1, k=5)
+        assert snapshot.spatial_index.within_radius(
+            latitude=1, longitude=1, meters=1_000_000
+        ) == SpatialIndex(vehicles).within_radius(latitude=1, longitude=1, meters=1_000_000)
+
+
+def test_upsert() -> None:
+    snapshot = FleetSnapshot()
+    vehicle = Vehicle("Toyota", "Camry", 2021, "red", 21000, 0.0, 0.0, id=1)
+
+    assert snapshot.upsert(vehicle) == FleetDiff(added=[vehicle])
+    assert snapshot.upsert(vehicle) == FleetDiff()
+    assert snapshot.upsert(replace(vehicle, color="black")).changed[0].color == "black"
+    assert snapshot.get(1) == replace(vehicle, color="black")
+
+
+def test_vehicles__copied_in_and_out() -> None:
+    fleet = [replace(vehicle, color="red") for vehicle in make_fleet(3)]
+    snapshot = FleetSnapshot()
+    snapshot.apply(fleet)
+    red = parse_params({"color": "red"})
+
+    fleet[0].color = "blue"
+    snapshot.select(red)[1].color = "blue"
+    snapshot.k_nearest(latitude=0, longitude=0, k=3)[0][0].color = "blue"
+
+    assert [vehicle.color for vehicle in snapshot.vehicles] == ["red", "red", "red"]
+    assert len(snapshot.select(red)) == 3
+    assert snapshot.upsert(fleet[0]) == FleetDiff(changed=[fleet[0]])
+    assert snapshot.select(parse_params({"color": "blue"})) == [fleet[0]]
+    assert snapshot.discard(vehicle_id=1) == FleetDiff(removed=[1])
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from src.models import Vehicle
+from src.vehicle_manager import VehicleManager
+from src.vehicle_manager.spatial import SpatialIndex, scan_k_nearest, scan_within_radius
+from tests.helpers import make_fleet
+
+
+def test_nearest__matches_linear_scan() -> None:
+    fleet = make_fleet(500)
+    index = SpatialIndex(fleet)
+    rnd = random.Random(1)
+
+    for _ in range(50):
+        lat, lon = rnd.uniform(-90, 90), rnd.uniform(-180, 180)
+        point = Vehicle("", "", 0, "", 0, latitude=lat, longitude=lon)
+        expected = min(fleet, key=lambda v: VehicleManager._calculate_distance(point, v))
+
+        result = index.nearest(latitude=lat, longitude=lon)
+
+        assert result is not None
+        assert result[0] == expected
+        assert result[1] == pytest.approx(
+            VehicleManager._calculate_distance(point, expected), rel=1e-6
+        )
+
+
+def test_nearest__exclude() -> None:
+    fleet = make_fleet(100)
+    index = SpatialIndex(fleet)
+    target = fleet[10]
+
+    result = index.nearest(target.latitude, target.longitude, exclude=lambda v: v == target)
+
+    assert result is not None
+    assert result[0] != target
+
+
+def test_nearest__empty_index() -> None:
+    assert SpatialIndex([]).nearest(latitude=0, longitude=0) is None
+
+
+@pytest.mark.parametrize("k", [1, 5, 20])
+def test_k_nearest__matches_linear_scan(k: int) -> None:
+    fleet = make_fleet(300)
+    index = SpatialIndex(fleet)
+    point = Vehicle("", "", 0, "", 0, latitude=55.75, longitude=37.62)
+    expected = sorted(fleet, key=lambda v: VehicleManager._calculate_distance(point, v))[:k]
+
+    result = index.k_nearest(latitude=55.75, longitude=37.62, k=k)
+
+    assert [vehicle for vehicle, _ in result] == expected
+
+
+def test_k_nearest__k_larger_than_fleet() -> None:
+    fleet = make_fleet(3)
+
+    assert len(SpatialIndex(fleet).k_nearest(latitude=0, longitude=0, k=10)) == 3
+
+
+def test_within_radius__matches_linear_scan() -> None:
+    fleet = make_fleet(1000)
+    index = SpatialIndex(fleet)
+    point = Vehicle("", "", 0, "", 0, latitude=10.0, longitude=20.0)
+    meters = 2_000_000
+    expected = sorted(
+        (v for v in fleet if VehicleManager._calculate_distance(point, v) <= meters),
+        key=lambda v: VehicleManager._calculate_distance(point, v),
+    )
+
+    result = index.within_radius(latitude=10.0, longitude=20.0, meters=meters)
+
+    assert expected
+    assert [vehicle for vehicle, _ in result] == expected
+    assert all(distance <= meters for _, distance in result)
+
+
+def test_scan__matches_index() -> None:
+    fleet = make_fleet(300)
+    index = SpatialIndex(fleet)
+
+    assert scan_k_nearest(iter(fleet), latitude=40, longitude=-70, k=7) == index.k_nearest(
+        latitude=40, longitude=-70, k=7
+    )
+    assert scan_within_radius(
+        iter(fleet), latitude=40, longitude=-70, meters=3_000_000
+    ) == index.within_radius(latitude=40, longitude=-70, meters=3_000_000)
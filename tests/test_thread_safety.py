@@ -0,0 +1,53 @@
+import random
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+from src.fake_server import FakeVehiclesServer, generate_fleet
+from src.vehicle_manager import VehicleManager
+
+
+def worker_ops(manager: VehicleManager, seed: int) -> Callable[[], None]:
+    """A random mix of reads and writes; each worker only writes vehicles it created."""
+    rnd = random.Random(seed)
+    own: list[int] = []
+
+    def step() -> None:
+        match rnd.randrange(6):
+            case 0:
+                manager.get_vehicles()
+            case 1:
+                manager.get_vehicle(vehicle_id=rnd.randint(1, 100))
+            case 2:
+                manager.filter_vehicles({"color": "red", "price__lt": 50_000})
+            case 3:
+                manager.get_k_nearest((rnd.uniform(-90, 90), rnd.uniform(-180, 180)), k=3)
+            case 4:
+                own.append(manager.add_vehicle(replace(generate_fleet(1)[0], id=None)).id or 0)
+            case 5 if own:
+                manager.delete_vehicle(vehicle_id=own.pop())
+
+    return step
+
+
+def test_stress__mixed_workload_32_threads() -> None:
+    with (
+        FakeVehiclesServer(generate_fleet(100)) as server,
+        VehicleManager(
+            url=server.url, cache_ttl=0.05, vehicle_cache_size=50, pool_maxsize=32
+        ) as manager,
+        ThreadPoolExecutor(max_workers=32) as executor,
+    ):
+
+        def run(seed: int) -> None:
+            step = worker_ops(manager, seed)
+            for _ in range(30):
+                step()
+
+        for future in [executor.submit(run, seed) for seed in range(32)]:
+            future.result()
+
+        manager.invalidate_cache()
+        expected = sorted(vehicle_id or 0 for vehicle_id in server.vehicles)
+        assert sorted(vehicle.id or 0 for vehicle in manager.get_vehicles()) == expected
+        assert sorted(vehicle.id or 0 for vehicle in manager.snapshot.vehicles) == expected
@@ -0,0 +1,63 @@
+import pytest
+
+from src.models import Vehicle, VehicleTable
+from src.vehicle_manager import VehicleManager
+from tests.helpers import make_fleet
+
+np = pytest.importorskip("numpy")
+vectorized = pytest.importorskip("src.vehicle_manager.vectorized")
+
+
+def test_distance_matrix__matches_scalar() -> None:
+    depots = make_fleet(7, seed=1)
+    fleet = make_fleet(40, seed=2)
+
+    matrix = vectorized.distance_matrix(
+        vectorized.coordinates(depots), vectorized.coordinates(fleet)
+    )
+
+    assert matrix.shape == (7, 40)
+    for i, depot in enumerate(depots):
+        for j, vehicle in enumerate(fleet):
+            assert matrix[i, j] == pytest.approx(
+                VehicleManager._calculate_distance(depot, vehicle), rel=1e-9, abs=1e-6
+            )
+
+
+def test_distance_matrix__identical_points() -> None:
+    points = [(55.753332, 37.621676)] * 3
+
+    assert np.all(np.isfinite(vectorized.distance_matrix(points, points)))
+
+
+def test_nearest__matches_scalar() -> None:
+    depots = make_fleet(25, seed=3)
+    fleet = make_fleet(200, seed=4)
+
+    indices, distances = vectorized.nearest(
+        vectorized.coordinates(depots), vectorized.coordinates(fleet), chunk_size=8
+    )
+
+    for depot, index, distance in zip(depots, indices, distances, strict=True):
+        expected = min(fleet, key=lambda v: VehicleManager._calculate_distance(depot, v))
+        assert fleet[index] == expected
+        assert distance == pytest.approx(VehicleManager._calculate_distance(depot, expected))
+
+
+def test_nearest__empty_targets() -> None:
+    with pytest.raises(ValueError, match="'targets' must contain at least one point"):
+        vectorized.nearest([(0.0, 0.0)], [])
+
+
+def test_coordinates() -> None:
+    vehicle = Vehicle("Toyota", "Camry", 2021, "red", 21000, latitude=1.5, longitude=2.5)
+
+    assert vectorized.coordinates([vehicle]).tolist() == [[1.5, 2.5]]
+
+
+def test_coordinates__vehicle_table() -> None:
+    fleet = make_fleet(5)
+
+    assert np.array_equal(
+        vectorized.coordinates(VehicleTable.from_vehicles(fleet)), vectorized.coordinates(fleet)
+    )
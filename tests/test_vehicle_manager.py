@@ -1,9 +1,26 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
 import pytest
+from requests.adapters import HTTPAdapter
 from requests_mock import Mocker as RequestsMocker
 
-from src.exeptions import VehicleNotFoundError
+from src.exeptions import (
+    VehicleManagerAPIError,
+    VehicleNotFoundError,
+    VehiclesInavlidResponseError,
+)
 from src.models import Vehicle
 from src.vehicle_manager import VehicleManager
+from src.vehicle_manager.api import create_session
+from src.vehicle_manager.cache import CacheInfo
+from src.vehicle_manager.distance import DistanceMode
+from src.vehicle_manager.snapshot import FleetDiff
+from tests.helpers import make_fleet, wait_for
 
 
 @pytest.fixture()
@@ -572,3 +589,894 @@ def test_get_nearest_vehicle__not_found(
     )
     with pytest.raises(VehicleNotFoundError, match="'Vehicle' object not found with id=1"):
         manager.get_nearest_vehicle(vehicle_id=car_id)
+
+
+def test_get_k_nearest__by_id(
+    base_url: str, manager: VehicleManager, requests_mock: RequestsMocker
+) -> None:
+    requests_mock.get(
+        url=f"{base_url}/vehicles/1",
+        json={
+            "id": 1,
+            "name": "Toyota",
+            "model": "Camry",
+            "year": 2021,
+            "color": "red",
+            "price": 21000,
+            "latitude": 55.753332,
+            "longitude": 37.621676,
+        },
+    )
+    requests_mock.get(
+        url=f"{base_url}/vehicles",
+        json=[
+            {
+                "id": 1,
+                "name": "Toyota",
+                "model": "Camry",
+                "year": 2021,
+                "color": "red",
+                "price": 21000,
+                "latitude": 55.753332,
+                "longitude": 37.621676,
+            },
+            {
+                "id": 2,
+                "name": "BMW",
+                "model": "X5",
+                "year": 2015,
+                "color": "black",
+                "price": 20000,
+                "latitude": 59.986607,
+                "longitude": 30.321435,
+            },
+            {
+                "id": 3,
+                "name": "Mercedes",
+                "model": "S500",
+                "year": 2009,
+                "color": "white",
+                "price": 40000,
+                "latitude": 59.950317,
+                "longitude": 30.31799,
+            },
+        ],
+    )
+
+    assert [v.id for v in manager.get_k_nearest(point_or_id=1, k=2)] == [3, 2]
+
+
+def test_get_k_nearest__by_point(
+    base_url: str, manager: VehicleManager, requests_mock: RequestsMocker
+) -> None:
+    requests_mock.get(
+        url=f"{base_url}/vehicles",
+        json=[
+            {
+                "id": 1,
+                "name": "Toyota",
+                "model": "Camry",
+                "year": 2021,
+                "color": "red",
+                "price": 21000,
+                "latitude": 55.753332,
+                "longitude": 37.621676,
+            },
+            {
+                "id": 2,
+                "name": "BMW",
+                "model": "X5",
+                "year": 2015,
+                "color": "black",
+                "price": 20000,
+                "latitude": 59.986607,
+                "longitude": 30.321435,
+            },
+        ],
+    )
+
+    assert [v.id for v in manager.get_k_nearest(point_or_id=(59.9, 30.3), k=10)] == [2, 1]
+
+
+def test_get_within_radius(
+    base_url: str, manager: VehicleManager, requests_mock: RequestsMocker
+) -> None:
+    requests_mock.get(
+        url=f"{base_url}/vehicles",
+        json=[
+            {
+                "id": 1,
+                "name": "Toyota",
+                "model": "Camry",
+                "year": 2021,
+                "color": "red",
+                "price": 21000,
+                "latitude": 55.753332,
+                "longitude": 37.621676,
+            },
+            {
+                "id": 2,
+                "name": "BMW",
+                "model": "X5",
+                "year": 2015,
+                "color": "black",
+                "price": 20000,
+                "latitude": 59.986607,
+                "longitude": 30.321435,
+            },
+            {
+                "id": 3,
+                "name": "Mercedes",
+                "model": "S500",
+                "year": 2009,
+                "color": "white",
+                "price": 40000,
+                "latitude": 59.950317,
+                "longitude": 30.31799,
+            },
+        ],
+    )
+
+    result = manager.get_within_radius(point=(59.986607, 30.321435), meters=5000)
+
+    assert [v.id for v in result] == [2, 3]
+
+
+def test_get_distance__haversine_mode(base_url: str, requests_mock: RequestsMocker) -> None:
+    manager = VehicleManager(url=base_url, distance_mode=DistanceMode.HAVERSINE)
+    requests_mock.get(
+        url=f"{base_url}/vehicles/1",
+        json={
+            "id": 1,
+            "name": "Toyota",
+            "model": "Camry",
+            "year": 2021,
+            "color": "red",
+            "price": 21000,
+            "latitude": 55.753332,
+            "longitude": 37.621676,
+        },
+    )
+    requests_mock.get(
+        url=f"{base_url}/vehicles/2",
+        json={
+            "id": 2,
+            "name": "BMW",
+            "model": "X5",
+            "year": 2015,
+            "color": "black",
+            "price": 20000,
+            "latitude": 59.986607,
+            "longitude": 30.321435,
+        },
+    )
+
+    assert manager.get_distance(id1=1, id2=2) == pytest.approx(638005.0864183326)
+
+
+def test_get_vehicles__cached(base_url: str, requests_mock: RequestsMocker) -> None:
+    manager = VehicleManager(url=base_url, cache_ttl=60)
+    list_mock = requests_mock.get(
+        url=f"{base_url}/vehicles",
+        json=[
+            {
+                "id": 1,
+                "name": "Toyota",
+                "model": "Camry",
+                "year": 2021,
+                "color": "red",
+                "price": 21000,
+                "latitude": 55.753332,
+                "longitude": 37.621676,
+            },
+        ],
+    )
+
+    manager.get_vehicles()
+    manager.filter_vehicles(params={"name": "Toyota"})
+    manager.get_k_nearest(point_or_id=(0.0, 0.0), k=1)
+
+    assert list_mock.call_count == 1
+
+
+def test_get_vehicles__cache_invalidated_on_write(
+    base_url: str, requests_mock: RequestsMocker
+) -> None:
+    manager = VehicleManager(url=base_url, cache_ttl=60)
+    list_mock = requests_mock.get(url=f"{base_url}/vehicles", json=[])
+    requests_mock.delete(url=f"{base_url}/vehicles/1", json={})
+
+    manager.get_vehicles()
+    manager.delete_vehicle(vehicle_id=1)
+    manager.get_vehicles()
+
+    assert list_mock.call_count == 2
+
+
+def test_get_vehicle__cached(base_url: str, requests_mock: RequestsMocker) -> None:
+    manager = VehicleManager(url=base_url, vehicle_cache_size=10)
+    vehicle_mock = requests_mock.get(
+        url=f"{base_url}/vehicles/1",
+        json={
+            "id": 1,
+            "name": "Toyota",
+            "model": "Camry",
+            "year": 2021,
+            "color": "red",
+            "price": 21000,
+            "latitude": 55.753332,
+            "longitude": 37.621676,
+        },
+    )
+
+    manager.get_vehicle(vehicle_id=1)
+    manager.get_vehicle(vehicle_id=1)
+
+    assert vehicle_mock.call_count == 1
+    assert manager.vehicle_cache_info() == CacheInfo(hits=1, misses=1, maxsize=10, currsize=1)
+
+
+def test_get_vehicle__cache_populated_from_list(
+    base_url: str, requests_mock: RequestsMocker
+) -> None:
+    manager = VehicleManager(url=base_url, vehicle_cache_size=10)
+    requests_mock.get(
+        url=f"{base_url}/vehicles",
+        json=[
+            {
+                "id": 1,
+                "name": "Toyota",
+                "model": "Camry",
+                "year": 2021,
+                "color": "red",
+                "price": 21000,
+                "latitude": 55.753332,
+                "longitude": 37.621676,
+            },
+        ],
+    )
+    vehicle_mock = requests_mock.get(url=f"{base_url}/vehicles/1", json={})
+
+    manager.get_vehicles()
+
+    assert manager.get_vehicle(vehicle_id=1).name == "Toyota"
+    assert vehicle_mock.call_count == 0
+
+
+def test_get_vehicle__cache_write_through(base_url: str, requests_mock: RequestsMocker) -> None:
+    manager = VehicleManager(url=base_url, vehicle_cache_size=10)
+    data = {
+        "id": 1,
+        "name": "Mercedes",
+        "model": "S500",
+        "year": 2009,
+        "color": "white",
+        "price": 40000,
+        "latitude": 59.950317,
+        "longitude": 30.31799,
+    }
+    requests_mock.put(url=f"{base_url}/vehicles/1", json=data)
+    requests_mock.delete(url=f"{base_url}/vehicles/1", json={})
+    vehicle_mock = requests_mock.get(
+        url=f"{base_url}/vehicles/1", status_code=404, json={"error": "Vehicle not found"}
+    )
+
+    manager.update_vehicle(vehicle=Vehicle.parse(data))
+    assert manager.get_vehicle(vehicle_id=1) == Vehicle.parse(data)
+    assert vehicle_mock.call_count == 0
+
+    manager.delete_vehicle(vehicle_id=1)
+    with pytest.raises(VehicleNotFoundError):
+        manager.get_vehicle(vehicle_id=1)
+
+
+def test_get_vehicle__read_racing_update_not_cached(
+    base_url: str, requests_mock: RequestsMocker
+) -> None:
+    manager = VehicleManager(url=base_url, vehicle_cache_size=10)
+    old = {
+        "id": 1,
+        "name": "Toyota",
+        "model": "Camry",
+        "year": 2021,
+        "color": "red",
+        "price": 21000,
+        "latitude": 55.753332,
+        "longitude": 37.621676,
+    }
+    new = {**old, "price": 19000}
+    requests_mock.put(url=f"{base_url}/vehicles/1", json=new)
+
+    def update_in_flight(request: Any, context: Any) -> dict[str, Any]:
+        # The update lands while the read is in flight, the read still returns the old row.
+        manager.update_vehicle(vehicle=Vehicle.parse(new))
+        return old
+
+    requests_mock.get(url=f"{base_url}/vehicles/1", json=update_in_flight)
+
+    assert manager.get_vehicle(vehicle_id=1) == Vehicle.parse(old)
+    assert manager.get_vehicle(vehicle_id=1) == Vehicle.parse(new)
+
+
+def test_get_vehicle__read_racing_delete_not_cached(
+    base_url: str, requests_mock: RequestsMocker
+) -> None:
+    manager = VehicleManager(url=base_url, vehicle_cache_size=10)
+    record = {
+        "id": 1,
+        "name": "Toyota",
+        "model": "Camry",
+        "year": 2021,
+        "color": "red",
+        "price": 21000,
+        "latitude": 55.753332,
+        "longitude": 37.621676,
+    }
+    reads = iter([record])
+
+    def read_in_flight(request: Any, context: Any) -> dict[str, Any]:
+        if (found := next(reads, None)) is None:
+            context.status_code = 404
+            return {"error": "Vehicle not found"}
+        return found
+
+    def delete_during_read(request: Any, context: Any) -> dict[str, Any]:
+        # A read started before the delete returns the vehicle after it was removed.
+        assert manager._load_vehicle(vehicle_id=1) == Vehicle.parse(record)
+        return {}
+
+    requests_mock.get(url=f"{base_url}/vehicles/1", json=read_in_flight)
+    requests_mock.delete(url=f"{base_url}/vehicles/1", json=delete_during_read)
+
+    manager.delete_vehicle(vehicle_id=1)
+
+    with pytest.raises(VehicleNotFoundError):
+        manager.get_vehicle(vehicle_id=1)
+
+
+def test_get_vehicles_by_ids(
+    base_url: str, manager: VehicleManager, requests_mock: RequestsMocker
+) -> None:
+    mocks = {
+        car_id: requests_mock.get(
+            url=f"{base_url}/vehicles/{car_id}",
+            json={
+                "id": car_id,
+                "name": "Toyota",
+                "model": "Camry",
+                "year": 2021,
+                "color": "red",
+                "price": 21000,
+                "latitude": 55.753332,
+                "longitude": 37.621676,
+            },
+        )
+        for car_id in (1, 2, 3)
+    }
+
+    result = manager.get_vehicles_by_ids([3, 1, 3, 2, 1])
+
+    assert [vehicle.id for vehicle in result] == [3, 1, 2]
+    assert all(mock.call_count == 1 for mock in mocks.values())
+
+
+def test_get_vehicles_by_ids__not_found(
+    base_url: str, manager: VehicleManager, requests_mock: RequestsMocker
+) -> None:
+    requests_mock.get(
+        url=f"{base_url}/vehicles/1",
+        json={
+            "id": 1,
+            "name": "Toyota",
+            "model": "Camry",
+            "year": 2021,
+            "color": "red",
+            "price": 21000,
+            "latitude": 55.753332,
+            "longitude": 37.621676,
+        },
+    )
+    requests_mock.get(
+        url=f"{base_url}/vehicles/2", status_code=404, json={"error": "Vehicle not found"}
+    )
+
+    with pytest.raises(VehicleNotFoundError, match="'Vehicle' object not found with id=2"):
+        manager.get_vehicles_by_ids([1, 2])
+
+
+def test_get_distance__same_vehicle(
+    base_url: str, manager: VehicleManager, requests_mock: RequestsMocker
+) -> None:
+    vehicle_mock = requests_mock.get(
+        url=f"{base_url}/vehicles/1",
+        json={
+            "id": 1,
+            "name": "Toyota",
+            "model": "Camry",
+            "year": 2021,
+            "color": "red",
+            "price": 21000,
+            "latitude": 55.753332,
+            "longitude": 37.621676,
+        },
+    )
+
+    assert manager.get_distance(id1=1, id2=1) == 0
+    assert vehicle_mock.call_count == 1
+
+
+def test_update_vehicles__reports_per_item_result(
+    base_url: str, manager: VehicleManager, requests_mock: RequestsMocker
+) -> None:
+    data = {
+        "name": "Mercedes",
+        "model": "S500",
+        "year": 2009,
+        "color": "white",
+        "price": 40000,
+        "latitude": 59.950317,
+        "longitude": 30.31799,
+    }
+    requests_mock.put(url=f"{base_url}/vehicles/1", json={**data, "id": 1})
+    requests_mock.put(
+        url=f"{base_url}/vehicles/2", status_code=404, json={"error": "Vehicle not found"}
+    )
+    requests_mock.put(url=f"{base_url}/vehicles/3", json={**data, "id": 3})
+    vehicles = [Vehicle.parse({**data, "id": car_id}) for car_id in (1, 2, None, 3)]
+
+    result = manager.update_vehicles(vehicles)
+
+    assert [vehicle.id for vehicle in result.succeeded] == [1, 3]
+    assert [(item.id, type(err)) for item, err in result.failed] == [
+        (2, VehicleNotFoundError),
+        (None, ValueError),
+    ]
+    assert result.total == 4
+    assert result.throughput > 0
+
+
+def test_add_vehicles(
+    base_url: str, manager: VehicleManager, requests_mock: RequestsMocker
+) -> None:
+    data = {
+        "name": "Mercedes",
+        "model": "S500",
+        "year": 2009,
+        "color": "white",
+        "price": 40000,
+        "latitude": 59.950317,
+        "longitude": 30.31799,
+    }
+    create_mock = requests_mock.post(url=f"{base_url}/vehicles", json={**data, "id": 1})
+
+    result = manager.add_vehicles([Vehicle.parse(data)] * 5)
+
+    assert len(result.succeeded) == 5
+    assert result.failed == []
+    assert create_mock.call_count == 5
+
+
+def test_delete_vehicles(
+    base_url: str, manager: VehicleManager, requests_mock: RequestsMocker
+) -> None:
+    requests_mock.delete(url=f"{base_url}/vehicles/1", json={})
+    requests_mock.delete(
+        url=f"{base_url}/vehicles/2", status_code=500, json={"error": "Internal error"}
+    )
+
+    result = manager.delete_vehicles([1, 2])
+
+    assert result.succeeded == [1]
+    assert [(item, type(err)) for item, err in result.failed] == [(2, VehicleManagerAPIError)]
+
+
+def test_iter_vehicles(
+    base_url: str, manager: VehicleManager, requests_mock: RequestsMocker
+) -> None:
+    requests_mock.get(
+        url=f"{base_url}/vehicles",
+        json=[
+            {
+                "id": 1,
+                "name": "Toyota",
+                "model": "Camry",
+                "year": 2021,
+                "color": "red",
+                "price": 21000,
+                "latitude": 55.753332,
+                "longitude": 37.621676,
+            },
+            {
+                "id": 2,
+                "name": "BMW",
+                "model": "X5",
+                "year": 2015,
+                "color": "black",
+                "price": 20000,
+                "latitude": 59.986607,
+                "longitude": 30.321435,
+            },
+        ],
+    )
+
+    vehicles = manager.iter_vehicles()
+
+    assert next(vehicles).id == 1
+    assert [vehicle.id for vehicle in vehicles] == [2]
+
+
+def test_iter_vehicles__invalid_response(
+    base_url: str, manager: VehicleManager, requests_mock: RequestsMocker
+) -> None:
+    requests_mock.get(url=f"{base_url}/vehicles", text='[{"id": 1')
+
+    with pytest.raises(VehiclesInavlidResponseError):
+        list(manager.iter_vehicles())
+
+
+def test_get_vehicle_table(
+    base_url: str, manager: VehicleManager, requests_mock: RequestsMocker
+) -> None:
+    requests_mock.get(
+        url=f"{base_url}/vehicles",
+        json=[
+            {
+                "id": 1,
+                "name": "Toyota",
+                "model": "Camry",
+                "year": 2021,
+                "color": "red",
+                "price": 21000,
+                "latitude": 55.753332,
+                "longitude": 37.621676,
+            },
+        ],
+    )
+
+    table = manager.get_vehicle_table()
+
+    assert list(table) == [
+        Vehicle(
+            id=1,
+            name="Toyota",
+            model="Camry",
+            year=2021,
+            color="red",
+            price=21000,
+            latitude=55.753332,
+            longitude=37.621676,
+        )
+    ]
+
+
+@pytest.mark.parametrize("cache_ttl", [0, 60])
+def test_filter_vehicles__range_and_in(
+    base_url: str, requests_mock: RequestsMocker, cache_ttl: float
+) -> None:
+    manager = VehicleManager(url=base_url, cache_ttl=cache_ttl)
+    requests_mock.get(
+        url=f"{base_url}/vehicles",
+        json=[
+            {
+                "id": 1,
+                "name": "Toyota",
+                "model": "Camry",
+                "year": 2021,
+                "color": "red",
+                "price": 21000,
+                "latitude": 55.753332,
+                "longitude": 37.621676,
+            },
+            {
+                "id": 2,
+                "name": "BMW",
+                "model": "X5",
+                "year": 2015,
+                "color": "black",
+                "price": 20000,
+                "latitude": 59.986607,
+                "longitude": 30.321435,
+            },
+            {
+                "id": 3,
+                "name": "Mercedes",
+                "model": "S500",
+                "year": 2009,
+                "color": "white",
+                "price": 40000,
+                "latitude": 59.950317,
+                "longitude": 30.31799,
+            },
+        ],
+    )
+
+    result = manager.filter_vehicles(
+        params={"price__lt": 30000, "year__gte": 2010, "color__in": ["black", "white"]}
+    )
+
+    assert [vehicle.id for vehicle in result] == [2]
+
+
+class FakeVehiclesBackend:
+    """``GET /vehicles`` double that filters by the given query parameters and counts bytes."""
+
+    def __init__(
+        self, vehicles: list[dict[str, Any]], filter_fields: set[str], ignore_case: bool = False
+    ) -> None:
+        self.vehicles = vehicles
+        self.filter_fields = filter_fields
+        self.ignore_case = ignore_case
+        self.bytes_sent = 0
+
+    def __call__(self, request: Any, context: Any) -> str:
+        query = {
+            field: values[0]
+            for field, values in parse_qs(urlsplit(request.url).query).items()
+            if field in self.filter_fields
+        }
+        rows = [
+            vehicle
+            for vehicle in self.vehicles
+            if all(self._matches(str(vehicle[field]), value) for field, value in query.items())
+        ]
+        body = json.dumps(rows)
+        self.bytes_sent += len(body)
+        return body
+
+    def _matches(self, actual: str, expected: str) -> bool:
+        if self.ignore_case:
+            return actual.casefold() == expected.casefold()
+        return actual == expected
+
+
+@pytest.fixture()
+def backend_vehicles() -> list[dict[str, Any]]:
+    return [
+        {
+            "id": i,
+            "name": name,
+            "model": "Model",
+            "year": 2000 + i % 20,
+            "color": "red",
+            "price": 1000 * i,
+            "latitude": 55.753332,
+            "longitude": 37.621676,
+        }
+        for i, name in enumerate(["Toyota", "BMW", "Mercedes", "Lada"] * 25, start=1)
+    ]
+
+
+def test_probe_server_filters(
+    base_url: str, requests_mock: RequestsMocker, backend_vehicles: list[dict[str, Any]]
+) -> None:
+    manager = VehicleManager(url=base_url, server_filters=True)
+    requests_mock.get(
+        url=f"{base_url}/vehicles",
+        text=FakeVehiclesBackend(backend_vehicles, filter_fields={"name", "year"}),
+    )
+
+    assert manager.probe_server_filters() == {"name", "year"}
+
+
+def test_filter_vehicles__server_filters(
+    base_url: str, requests_mock: RequestsMocker, backend_vehicles: list[dict[str, Any]]
+) -> None:
+    backend = FakeVehiclesBackend(backend_vehicles, filter_fields={"name", "year"})
+    requests_mock.get(url=f"{base_url}/vehicles", text=backend)
+    params = {"name": "Toyota", "price__lt": 50000}
+
+    local = VehicleManager(url=base_url).filter_vehicles(params=params)
+    local_bytes = backend.bytes_sent
+    pushdown_manager = VehicleManager(url=base_url, server_filters=True)
+    pushdown_manager.probe_server_filters()
+    backend.bytes_sent = 0
+    pushed = pushdown_manager.filter_vehicles(params=params)
+
+    assert pushed == local
+    assert [vehicle.id for vehicle in pushed] == list(range(1, 50, 4))
+    assert requests_mock.last_request is not None
+    assert requests_mock.last_request.qs == {"name": ["toyota"]}
+    assert backend.bytes_sent * 3 < local_bytes
+
+
+def test_filter_vehicles__server_ignores_filters(
+    base_url: str, requests_mock: RequestsMocker, backend_vehicles: list[dict[str, Any]]
+) -> None:
+    manager = VehicleManager(url=base_url, server_filters=True)
+    requests_mock.get(
+        url=f"{base_url}/vehicles", text=FakeVehiclesBackend(backend_vehicles, filter_fields=set())
+    )
+
+    result = manager.filter_vehicles(params={"name": "BMW", "year": 2002})
+
+    assert manager.probe_server_filters() == frozenset()
+    assert [vehicle.id for vehicle in result] == [2, 22, 42, 62, 82]
+
+
+def test_filter_vehicles__server_filters_rechecked_locally(
+    base_url: str, requests_mock: RequestsMocker, backend_vehicles: list[dict[str, Any]]
+) -> None:
+    backend_vehicles[1]["name"] = "toyota"
+    manager = VehicleManager(url=base_url, server_filters=True)
+    requests_mock.get(
+        url=f"{base_url}/vehicles",
+        text=FakeVehiclesBackend(backend_vehicles, filter_fields={"name"}, ignore_case=True),
+    )
+
+    result = manager.filter_vehicles(params={"name": "Toyota", "price__lt": 10000})
+
+    assert manager.probe_server_filters() == {"name"}
+    assert [vehicle.id for vehicle in result] == [1, 5, 9]
+
+
+def test_get_vehicles__not_modified_reuses_snapshot(
+    base_url: str, manager: VehicleManager, requests_mock: RequestsMocker
+) -> None:
+    data = {
+        "id": 1,
+        "name": "Toyota",
+        "model": "Camry",
+        "year": 2021,
+        "color": "red",
+        "price": 21000,
+        "latitude": 55.753332,
+        "longitude": 37.621676,
+    }
+    requests_mock.get(
+        url=f"{base_url}/vehicles",
+        response_list=[{"json": [data], "headers": {"ETag": '"v1"'}}, {"status_code": 304}],
+    )
+
+    first = manager.get_vehicles()
+    first[0].price = 1
+    second = manager.get_vehicles()
+
+    assert second == [Vehicle.parse(data)]
+    assert second[0] is not first[0]
+
+
+def test_snapshot__change_feed(base_url: str, requests_mock: RequestsMocker) -> None:
+    manager = VehicleManager(url=base_url)
+    toyota = {
+        "id": 1,
+        "name": "Toyota",
+        "model": "Camry",
+        "year": 2021,
+        "color": "red",
+        "price": 21000,
+        "latitude": 55.753332,
+        "longitude": 37.621676,
+    }
+    bmw = {
+        "id": 2,
+        "name": "BMW",
+        "model": "X5",
+        "year": 2015,
+        "color": "black",
+        "price": 20000,
+        "latitude": 59.986607,
+        "longitude": 30.321435,
+    }
+    requests_mock.get(
+        url=f"{base_url}/vehicles",
+        response_list=[{"json": [toyota, bmw]}, {"json": [{**toyota, "latitude": 55.0}]}],
+    )
+    diffs: list[FleetDiff] = []
+    manager.snapshot.subscribe(diffs.append)
+
+    manager.get_vehicles()
+    manager.get_vehicles()
+
+    assert [vehicle.id for vehicle in diffs[0].added] == [1, 2]
+    assert diffs[1] == FleetDiff(changed=[Vehicle.parse({**toyota, "latitude": 55.0})], removed=[2])
+
+
+def test_snapshot__not_kept_without_readers(base_url: str, requests_mock: RequestsMocker) -> None:
+    fleet = make_fleet(20)
+    requests_mock.get(url=f"{base_url}/vehicles", json=[asdict(v) for v in fleet])
+    manager = VehicleManager(url=base_url)
+
+    assert manager.get_vehicles() == fleet
+    assert len(manager.snapshot) == 0
+
+
+def test_snapshot__respects_cache_max_size(base_url: str, requests_mock: RequestsMocker) -> None:
+    fleet = make_fleet(20)
+    requests_mock.get(
+        url=f"{base_url}/vehicles",
+        response_list=[
+            {"json": [asdict(v) for v in fleet[:5]]},
+            {"json": [asdict(v) for v in fleet]},
+        ],
+    )
+    manager = VehicleManager(url=base_url, cache_ttl=60, cache_max_size=10)
+    point = fleet[7].latitude, fleet[7].longitude
+
+    assert manager.get_k_nearest(point, k=1) != [fleet[7]]
+    assert len(manager.snapshot) == 5
+    manager.invalidate_cache()
+    assert manager.get_k_nearest(point, k=1) == [fleet[7]]
+    assert len(manager.snapshot) == 0
+    assert manager.filter_vehicles({"id__in": [3, 15]}) == [fleet[2], fleet[14]]
+
+
+def test_pool_sized_to_workers(base_url: str) -> None:
+    with VehicleManager(url=base_url, max_workers=24) as manager:
+        adapter = manager.api.session.get_adapter(base_url)
+        assert isinstance(adapter, HTTPAdapter)
+
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == 24
+
+
+def test_shared_session(base_url: str, requests_mock: RequestsMocker) -> None:
+    session = create_session(pool_maxsize=4)
+    requests_mock.get(
+        url=f"{base_url}/vehicles/1",
+        json={
+            "id": 1,
+            "name": "Toyota",
+            "model": "Camry",
+            "year": 2021,
+            "color": "red",
+            "price": 21000,
+            "latitude": 55.753332,
+            "longitude": 37.621676,
+        },
+    )
+
+    with VehicleManager(url=base_url, session=session) as first:
+        first.get_vehicle(vehicle_id=1)
+    with VehicleManager(url=base_url, session=session) as second:
+        second.get_vehicle(vehicle_id=1)
+
+    assert first.api.session is second.api.session is session
+    assert not first.api.owns_session
+
+
+def test_transfer_stats(
+    base_url: str, manager: VehicleManager, requests_mock: RequestsMocker
+) -> None:
+    requests_mock.get(url=f"{base_url}/vehicles", json=[])
+
+    manager.get_vehicles()
+    manager.get_vehicles()
+
+    assert manager.transfer_stats().requests == 2
+    assert manager.transfer_stats().decoded_bytes == 4
+
+
+def test_single_flight__concurrent_reads(
+    base_url: str, manager: VehicleManager, requests_mock: RequestsMocker
+) -> None:
+    release = threading.Event()
+    record = {
+        "id": 1,
+        "name": "Toyota",
+        "model": "Camry",
+        "year": 2021,
+        "color": "red",
+        "price": 21000,
+        "latitude": 55.753332,
+        "longitude": 37.621676,
+    }
+
+    def blocking(payload: Any) -> Any:
+        def callback(request: Any, context: Any) -> Any:
+            release.wait()
+            return payload
+
+        return callback
+
+    list_mock = requests_mock.get(url=f"{base_url}/vehicles", json=blocking([record]))
+    vehicle_mock = requests_mock.get(url=f"{base_url}/vehicles/1", json=blocking(record))
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        lists = [executor.submit(manager.get_vehicles) for _ in range(8)]
+        vehicles = [executor.submit(manager.get_vehicle, 1) for _ in range(8)]
+        wait_for(lambda: manager._flight.coalesced == 14)
+        release.set()
+
+    assert list_mock.call_count == 1
+    assert vehicle_mock.call_count == 1
+    assert all(future.result() == [Vehicle.parse(data=record)] for future in lists)
+    assert len({id(future.result()) for future in vehicles}) == 1